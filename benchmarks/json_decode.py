@@ -0,0 +1,212 @@
+"""Benchmark JSON decoding of full-day flight lists.
+
+Generates realistic arrivals and departures payloads for a busy day at
+Arlanda from the schemas in flightinfov2.json, then compares decode time
+and allocations for the stdlib and orjson (when installed).
+
+Usage: python benchmarks/json_decode.py [--flights 650] [--rounds 20]
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta, timezone
+import importlib.util
+import json
+from pathlib import Path
+import random
+import time
+import tracemalloc
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+SCHEMA_FILE = ROOT / "flightinfov2.json"
+DECODER_FILE = ROOT / "custom_components" / "swedavia_flights" / "decoder.py"
+
+AIRLINES = [
+    ("SK", "SAS", "SAS"),
+    ("DY", "NAX", "Norwegian Air Shuttle"),
+    ("D8", "IBK", "Norwegian Air International"),
+    ("LH", "DLH", "Lufthansa"),
+    ("KL", "KLM", "KLM Royal Dutch Airlines"),
+    ("AY", "FIN", "Finnair"),
+    ("BA", "BAW", "British Airways"),
+    ("TK", "THY", "Turkish Airlines"),
+]
+AIRPORTS = [
+    ("OSL", "ENGM", "Oslo", "Oslo"),
+    ("CPH", "EKCH", "Köpenhamn", "Copenhagen"),
+    ("HEL", "EFHK", "Helsingfors", "Helsinki"),
+    ("FRA", "EDDF", "Frankfurt", "Frankfurt"),
+    ("LHR", "EGLL", "London Heathrow", "London Heathrow"),
+    ("AMS", "EHAM", "Amsterdam", "Amsterdam"),
+    ("LLA", "ESPA", "Luleå", "Lulea"),
+    ("UME", "ESNU", "Umeå", "Umea"),
+    ("IST", "LTFM", "Istanbul", "Istanbul"),
+]
+STATUSES = [
+    ("SCH", "Planerad", "Scheduled"),
+    ("DEL", "Försenad", "Delayed"),
+    ("LAN", "Landat", "Landed"),
+    ("DEP", "Avgått", "Departed"),
+]
+
+
+def load_decoder() -> Any:
+    """Load decoder.py without importing the Home Assistant integration."""
+    spec = importlib.util.spec_from_file_location("swedavia_decoder", DECODER_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class PayloadGenerator:
+    """Generate values for the flightinfo schemas."""
+
+    def __init__(self, schemas: dict[str, Any], seed: int = 0) -> None:
+        self._schemas = schemas
+        self._rnd = random.Random(seed)
+
+    def _resolve(self, schema: dict[str, Any]) -> dict[str, Any]:
+        if ref := schema.get("$ref"):
+            return self._schemas[ref.rsplit("/", 1)[-1]]
+        return schema
+
+    def _string(self, name: str, context: dict[str, Any]) -> str | None:
+        rnd = self._rnd
+        lower = name.lower()
+        if lower.endswith("utc") or lower.endswith("dateutc"):
+            if "actual" in lower or "lastbag" in lower or "firstbag" in lower:
+                if rnd.random() < 0.6:
+                    return None
+            offset = timedelta(minutes=rnd.choice((0, 0, 5, 10, 25)))
+            return (context["time"] + offset).strftime("%Y-%m-%dT%H:%M:%SZ")
+        if lower == "flightid" or lower == "callsign":
+            return context["flight_id"]
+        if "iata" in lower and "airport" in lower:
+            return context["remote"][0] if "departure" in lower else "ARN"
+        if "icao" in lower and "airport" in lower:
+            return context["remote"][1] if "departure" in lower else "ESSA"
+        if lower == "iata":
+            return context["airline"][0]
+        if lower == "icao":
+            return context["airline"][1]
+        if lower == "name":
+            return context["airline"][2]
+        if "swedish" in lower and "airport" in lower:
+            return context["remote"][2]
+        if "english" in lower and "airport" in lower:
+            return context["remote"][3]
+        if lower == "flightlegstatus":
+            return context["status"][0]
+        if lower == "flightlegstatusswedish":
+            return context["status"][1]
+        if lower == "flightlegstatusenglish":
+            return context["status"][2]
+        if lower == "terminal":
+            return rnd.choice(("2", "4", "5"))
+        if lower == "gate":
+            return f"{rnd.choice('FGK')}{rnd.randint(1, 69)}"
+        if lower == "baggageclaimunit":
+            return str(rnd.randint(1, 9))
+        if lower == "aircraftregistration":
+            return "SE-" + "".join(rnd.choice("ABCDEFGHIJKLMNOPRS") for _ in range(3))
+        if lower == "ssrcode":
+            return f"{rnd.randint(0, 7777):04d}"
+        if lower == "ifplid":
+            return f"AA{rnd.randint(10000000, 99999999)}"
+        if lower.endswith("action"):
+            return rnd.choice(("O", "C"))
+        if "swedish" in lower:
+            return "Gå till gate"
+        if "english" in lower:
+            return "Go to gate"
+        return "X"
+
+    def generate(self, schema: dict[str, Any], name: str, context: dict[str, Any]) -> Any:
+        schema = self._resolve(schema)
+        schema_type = schema.get("type")
+        if schema_type == "object" or "properties" in schema:
+            return {
+                key: self.generate(value, key, context)
+                for key, value in schema.get("properties", {}).items()
+            }
+        if schema_type == "array":
+            if name == "codeShareData":
+                return [f"{code}{self._rnd.randint(1000, 9999)}" for code in ("LH", "AY")][
+                    : self._rnd.randint(0, 2)
+                ]
+            if name.startswith("remarks"):
+                count = 1 if self._rnd.random() < 0.2 else 0
+            elif name == "viaDestinations":
+                count = 0
+            else:
+                count = 1
+            return [self.generate(schema["items"], name, context) for _ in range(count)]
+        if schema_type == "integer":
+            return self._rnd.randint(1, 40)
+        if schema_type == "boolean":
+            return False
+        return self._string(name, context)
+
+    def day(self, flight_schema: str, flights: int) -> dict[str, Any]:
+        """Generate a full-day flight list response."""
+        start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        items = []
+        for index in range(flights):
+            airline = self._rnd.choice(AIRLINES)
+            context = {
+                "time": start + timedelta(seconds=86400 * index // flights),
+                "flight_id": f"{airline[0]}{self._rnd.randint(100, 9999)}",
+                "airline": airline,
+                "remote": self._rnd.choice(AIRPORTS),
+                "status": self._rnd.choice(STATUSES),
+            }
+            items.append(
+                self.generate({"$ref": f"#/components/schemas/{flight_schema}"}, "", context)
+            )
+        return {"numberOfFlights": flights, "flights": items}
+
+
+def measure(decode, body: bytes, rounds: int) -> tuple[float, int]:
+    """Return the best decode time in ms and the peak allocation in bytes."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        decode(body)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    decode(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--flights", type=int, default=650, help="flights per day")
+    parser.add_argument("--rounds", type=int, default=20, help="timing rounds")
+    args = parser.parse_args()
+
+    decoder = load_decoder()
+    schemas = json.loads(SCHEMA_FILE.read_text(encoding="utf-8"))["components"]["schemas"]
+    generator = PayloadGenerator(schemas)
+
+    backends = {"json.loads": json.loads}
+    if decoder.orjson is not None:
+        backends["orjson.loads"] = decoder.orjson.loads
+
+    print(f"Default backend: {decoder.JSON_BACKEND}")
+    for flight_schema in ("arrivalFlight", "departureFlight"):
+        payload = generator.day(flight_schema, args.flights)
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        print(f"\n{flight_schema}: {args.flights} flights, {len(body) / 1024:.0f} KiB")
+        print(f"  {'backend':<14}{'best ms':>10}{'peak KiB':>12}")
+        for name, decode in backends.items():
+            assert decode(body) == payload
+            elapsed, peak = measure(decode, body, args.rounds)
+            print(f"  {name:<14}{elapsed:>10.2f}{peak / 1024:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
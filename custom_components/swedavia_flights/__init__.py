@@ -8,16 +8,26 @@ import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.event import async_track_time_interval
 
-from .api import SwedaviaFlightAPI
+from .api import ResponseCache, SingleFlight, SwedaviaFlightAPI
 from .api_counter import APICallCounter
+from .batch_fetch import BatchFetcher
 from .boost_mode import BoostMode
-from .const import CONF_API_KEY, CONF_API_KEY_SECONDARY, CONF_AIRPORT, DOMAIN
+from .budget import BudgetController
+from .circuit_breaker import CircuitBreaker
+from .const import CONF_API_KEY, CONF_API_KEY_SECONDARY, DOMAIN
 from .coordinator import SwedaviaFlightCoordinator
 from .key_rotation import should_warn_about_rotation, get_rotation_warning_message
-from .services import async_setup_services, async_unload_services
+from .models import StringInterner
+from .polling import PollingOrchestrator
+from .rate_limiter import RateLimiter
+from .services import (
+    SERVICE_UPDATE_API_KEYS,
+    async_setup_services,
+    async_unload_services,
+)
+from .session import async_close_session, async_get_session
 from .update_scheduler import UpdateScheduler
 
 _LOGGER = logging.getLogger(__name__)
@@ -33,7 +43,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
 
     # Set up services (only once)
-    if not hass.data[DOMAIN]:
+    if not hass.services.has_service(DOMAIN, SERVICE_UPDATE_API_KEYS):
         await async_setup_services(hass)
 
     # Initialize API call counter (shared across all entries)
@@ -44,6 +54,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     else:
         api_counter = hass.data[DOMAIN]["api_counter"]
 
+    # Initialize budget controller (shared across all entries)
+    if "budget_controller" not in hass.data[DOMAIN]:
+        hass.data[DOMAIN]["budget_controller"] = BudgetController(api_counter)
+    budget_controller = hass.data[DOMAIN]["budget_controller"]
+
     # Initialize boost mode manager (shared across all entries)
     if "boost_mode" not in hass.data[DOMAIN]:
         boost_mode = BoostMode(hass)
@@ -57,35 +72,77 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     else:
         boost_mode = hass.data[DOMAIN]["boost_mode"]
 
+    # Initialize batch fetcher for delta sync entries (shared across all entries)
+    if "batch_fetcher" not in hass.data[DOMAIN]:
+        hass.data[DOMAIN]["batch_fetcher"] = BatchFetcher(hass)
+    batch_fetcher = hass.data[DOMAIN]["batch_fetcher"]
+
+    # Initialize polling orchestrator (shared across all entries)
+    if "orchestrator" not in hass.data[DOMAIN]:
+        hass.data[DOMAIN]["orchestrator"] = PollingOrchestrator(hass)
+    orchestrator = hass.data[DOMAIN]["orchestrator"]
+
+    # Initialize rate limiter (shared across all entries)
+    if "rate_limiter" not in hass.data[DOMAIN]:
+        hass.data[DOMAIN]["rate_limiter"] = RateLimiter()
+    rate_limiter = hass.data[DOMAIN]["rate_limiter"]
+
+    # Initialize request coalescing (shared across all entries)
+    if "single_flight" not in hass.data[DOMAIN]:
+        hass.data[DOMAIN]["single_flight"] = SingleFlight()
+    single_flight = hass.data[DOMAIN]["single_flight"]
+
+    # Initialize response cache (shared across all entries)
+    if "response_cache" not in hass.data[DOMAIN]:
+        hass.data[DOMAIN]["response_cache"] = ResponseCache()
+    response_cache = hass.data[DOMAIN]["response_cache"]
+
+    # Initialize circuit breaker (shared across all entries)
+    if "circuit_breaker" not in hass.data[DOMAIN]:
+        hass.data[DOMAIN]["circuit_breaker"] = CircuitBreaker()
+    circuit_breaker = hass.data[DOMAIN]["circuit_breaker"]
+
+    # Initialize string interning for flight records (shared across all entries)
+    if "string_interner" not in hass.data[DOMAIN]:
+        hass.data[DOMAIN]["string_interner"] = StringInterner()
+    string_interner = hass.data[DOMAIN]["string_interner"]
+
     # Create API client
-    session = async_get_clientsession(hass)
+    session = async_get_session(hass)
     api_key = entry.data.get(CONF_API_KEY)
     api_key_secondary = entry.data.get(CONF_API_KEY_SECONDARY)
-    api = SwedaviaFlightAPI(session, api_key, api_key_secondary, api_counter)
+    api = SwedaviaFlightAPI(
+        session,
+        api_key,
+        api_key_secondary,
+        api_counter,
+        rate_limiter,
+        single_flight,
+        response_cache,
+        circuit_breaker=circuit_breaker,
+        string_interner=string_interner,
+    )
 
     # Create coordinator
     coordinator = SwedaviaFlightCoordinator(hass, api, entry)
     
     # Set boost mode manager
     coordinator.set_boost_mode(boost_mode)
+    coordinator.set_budget_controller(budget_controller)
+    coordinator.set_batch_fetcher(batch_fetcher)
 
-    # Apply staggered start if there's an offset
-    if hasattr(coordinator, '_update_offset') and coordinator._update_offset.total_seconds() > 0:
-        offset_seconds = int(coordinator._update_offset.total_seconds())
-        _LOGGER.info(
-            "Scheduling initial update for %s with %d second delay for load distribution",
-            entry.data.get(CONF_AIRPORT, "unknown"),
-            offset_seconds,
+    # Fetch initial data, in turn with the updates of other entries
+    try:
+        await orchestrator.async_run_exclusive(
+            coordinator.async_config_entry_first_refresh
         )
-        # Schedule delayed first refresh
-        async def delayed_first_refresh():
-            await asyncio.sleep(offset_seconds)
-            await coordinator.async_config_entry_first_refresh()
-        
-        hass.async_create_task(delayed_first_refresh())
-    else:
-        # Fetch initial data immediately
-        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        # Setup is retried with a new coordinator, stop serving this one
+        batch_fetcher.unregister(entry.entry_id)
+        raise
+
+    # Hand later updates to the orchestrator
+    coordinator.set_orchestrator(orchestrator)
 
     # Store coordinator
     hass.data[DOMAIN][entry.entry_id] = coordinator
@@ -102,7 +159,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 "=== Swedavia Flight Info - Update Schedule ===\n"
                 "Total airports configured: %d\n"
                 "Update interval: %d minutes\n"
-                "Calls per update cycle: %d\n"
+                "Calls per update cycle: %.1f\n"
                 "Updates per day: %d\n"
                 "Estimated daily API calls: %d\n"
                 "Estimated monthly API calls: %d (%.1f%% of limit)\n"
@@ -155,10 +212,29 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok := await hass.config_entries.async_unload_platforms(
         entry, PLATFORMS
     ):
-        hass.data[DOMAIN].pop(entry.entry_id)
-        
-        # Unload services if this is the last entry
-        if not hass.data[DOMAIN]:
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator.unset_orchestrator()
+
+        if batch_fetcher := hass.data[DOMAIN].get("batch_fetcher"):
+            batch_fetcher.unregister(entry.entry_id)
+
+        # Unload services, close the session and drop the shared strings
+        # with the last entry
+        if not any(
+            isinstance(value, SwedaviaFlightCoordinator)
+            for value in hass.data[DOMAIN].values()
+        ):
             await async_unload_services(hass)
+            await async_close_session(hass)
+            if string_interner := hass.data[DOMAIN].get("string_interner"):
+                string_interner.clear()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data when the last config entry is deleted."""
+    if not hass.config_entries.async_entries(DOMAIN):
+        # The live fetcher also cancels its pending delayed save
+        batch_fetcher = hass.data.get(DOMAIN, {}).pop("batch_fetcher", None)
+        await (batch_fetcher or BatchFetcher(hass)).async_remove()
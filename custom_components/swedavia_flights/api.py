@@ -2,20 +2,57 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 import logging
+import random
+import time
 from typing import Any, TYPE_CHECKING
 
 import aiohttp
 import async_timeout
 
-from .const import API_BASE_URL, API_TIMEOUT
+from .circuit_breaker import CircuitBreaker
+from .const import (
+    API_BASE_URL,
+    API_TIMEOUT,
+    FLIGHT_TYPE_ARRIVALS,
+    FLIGHT_TYPE_BOTH,
+    FLIGHT_TYPE_DEPARTURES,
+    QUERY_PAGE_SIZE,
+)
+from .date_planner import local_today
+from .decoder import json_loads
+from .models import StringInterner
+from .rate_limiter import RateLimiter
+from .session import ACCEPT_ENCODING
 
 if TYPE_CHECKING:
     from .api_counter import APICallCounter
 
 _LOGGER = logging.getLogger(__name__)
 
+MAX_CONCURRENT_REQUESTS = 4
+
+# Retry policy
+RETRY_MAX_ATTEMPTS = 4  # First attempt + 3 retries
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 20.0
+RETRY_BUDGET_PER_CYCLE = 6  # Retries allowed per update cycle and client
+RETRY_RESERVE_CALLS = 500  # Stop retrying when this few calls remain
+
+# Response cache limits
+CACHE_MAX_ENTRIES = 64
+CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+# Response cache TTL per date tier, in seconds
+CACHE_TTL_TODAY = 60  # Today and its neighbours change constantly
+CACHE_TTL_FUTURE = 3600  # Two or more days ahead barely change
+CACHE_TTL_PAST = 86400  # Finished days do not change anymore
+
 
 class SwedaviaAPIError(Exception):
     """Base exception for Swedavia API errors."""
@@ -25,9 +62,273 @@ class SwedaviaAPIConnectionError(SwedaviaAPIError):
     """Exception for connection errors."""
 
 
+class SwedaviaAPIAuthError(SwedaviaAPIError):
+    """Exception for rejected subscription keys."""
+
+
 class SwedaviaAPIRateLimitError(SwedaviaAPIError):
     """Exception for rate limit errors."""
 
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        """Initialize the exception with the server's Retry-After, if any."""
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class SwedaviaAPIServerError(SwedaviaAPIError):
+    """Exception for 5xx server errors."""
+
+
+class SwedaviaAPIDecodeError(SwedaviaAPIError):
+    """Exception for response bodies that are not valid JSON."""
+
+
+class SwedaviaAPICircuitOpenError(SwedaviaAPIError):
+    """Exception raised without a request while the circuit breaker is open."""
+
+
+# Errors that are worth retrying
+RETRYABLE_ERRORS = (
+    SwedaviaAPIConnectionError,
+    SwedaviaAPIRateLimitError,
+    SwedaviaAPIServerError,
+    SwedaviaAPIDecodeError,
+)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass
+class RetryPolicy:
+    """Capped exponential backoff with full jitter and a per-cycle budget."""
+
+    max_attempts: int = RETRY_MAX_ATTEMPTS
+    base_delay: float = RETRY_BASE_DELAY
+    max_delay: float = RETRY_MAX_DELAY
+    budget_per_cycle: int = RETRY_BUDGET_PER_CYCLE
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float | None:
+        """Get the delay before the next attempt, or None to give up.
+
+        A Retry-After from the server wins over the computed backoff, but a
+        wait longer than max_delay is not worth holding the update for.
+        """
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_delay else None
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+class SingleFlight:
+    """Share one in-flight request between identical concurrent callers.
+
+    The first caller for a key starts the request; callers arriving while
+    it runs await the same task and get the same decoded result (or the
+    same exception). Results must be treated as read-only.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the single-flight registry."""
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def async_run(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        """Run the request for a key, or join the one already running."""
+        if (task := self._inflight.get(key)) is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._done(key, done))
+        else:
+            self.coalesced += 1
+            _LOGGER.debug("Joining in-flight request for %s", key)
+
+        # Shield so one cancelled caller does not cancel the shared request
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Future) -> None:
+        """Forget a finished request."""
+        self._inflight.pop(key, None)
+        # Mark the exception retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+
+def cache_ttl_for_date(date_str: str) -> int:
+    """Get the cache TTL for a flight list date."""
+    try:
+        day = date.fromisoformat(date_str)
+    except ValueError:
+        return CACHE_TTL_TODAY
+
+    offset = (day - local_today()).days
+    if offset < -1:
+        return CACHE_TTL_PAST
+    if offset > 1:
+        return CACHE_TTL_FUTURE
+    return CACHE_TTL_TODAY
+
+
+@dataclass
+class _CacheEntry:
+    """A cached decoded response."""
+
+    payload: dict[str, Any]
+    size: int
+    expires: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+@dataclass
+class _APIResponse:
+    """A decoded API response with its HTTP cache validators."""
+
+    payload: dict[str, Any]
+    size: int = 0
+    etag: str | None = None
+    last_modified: str | None = None
+    not_modified: bool = False
+
+
+class ResponseCache:
+    """Per-process TTL + LRU cache of decoded flight lists.
+
+    Keyed by (airport, direction, date). Entries are evicted in least
+    recently used order when either the entry count or the total size of
+    the raw response bodies exceeds its limit.
+
+    Expired entries are kept until evicted, together with their ETag and
+    Last-Modified validators, so they can be revalidated with a conditional
+    request. A 304 answer renews the entry without decoding anything.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        max_bytes: int = CACHE_MAX_BYTES,
+    ) -> None:
+        """Initialize the response cache."""
+        self._entries: OrderedDict[tuple[str, str, str], _CacheEntry] = OrderedDict()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        # Conditional request bookkeeping
+        self.responses = 0
+        self.responses_with_validators = 0
+        self.conditional_requests = 0
+        self.not_modified = 0
+        self.not_modified_bytes = 0
+
+    def get(self, key: tuple[str, str, str]) -> dict[str, Any] | None:
+        """Get a fresh cached payload."""
+        entry = self._entries.get(key)
+        if entry is None or entry.expires <= time.monotonic():
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.payload
+
+    def get_validators(
+        self, key: tuple[str, str, str]
+    ) -> tuple[str | None, str | None] | None:
+        """Get the ETag and Last-Modified of a cached entry, if it has any."""
+        entry = self._entries.get(key)
+        if entry is None or (entry.etag is None and entry.last_modified is None):
+            return None
+        return entry.etag, entry.last_modified
+
+    def revalidated(
+        self, key: tuple[str, str, str], ttl: float
+    ) -> dict[str, Any] | None:
+        """Renew an entry after a 304 answer and return its payload."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        entry.expires = time.monotonic() + ttl
+        self._entries.move_to_end(key)
+        self.not_modified += 1
+        self.not_modified_bytes += entry.size
+        return entry.payload
+
+    def put(
+        self,
+        key: tuple[str, str, str],
+        payload: dict[str, Any],
+        size: int,
+        ttl: float,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Store a payload and evict old entries over the limits."""
+        self.responses += 1
+        if etag or last_modified:
+            self.responses_with_validators += 1
+
+        if key in self._entries:
+            self._remove(key)
+        if size > self._max_bytes:
+            return
+
+        self._entries[key] = _CacheEntry(
+            payload, size, time.monotonic() + ttl, etag, last_modified
+        )
+        self._bytes += size
+
+        while len(self._entries) > self._max_entries or self._bytes > self._max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: tuple[str, str, str]) -> None:
+        """Remove an entry."""
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        lookups = self.hits + self.misses
+
+        # Whether the upstream sends validators / answers 304 at all
+        if self.not_modified or self.responses_with_validators:
+            conditional_support = "supported"
+        elif self.responses:
+            conditional_support = "not_supported"
+        else:
+            conditional_support = "unknown"
+
+        return {
+            "cache_entries": len(self._entries),
+            "cache_bytes": self._bytes,
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "cache_hit_rate": round(self.hits / lookups * 100, 1) if lookups else 0.0,
+            "conditional_support": conditional_support,
+            "conditional_requests": self.conditional_requests,
+            "not_modified_responses": self.not_modified,
+            "not_modified_bytes_saved": self.not_modified_bytes,
+        }
+
 
 class SwedaviaFlightAPI:
     """Swedavia Flight Information API Client."""
@@ -38,33 +339,140 @@ class SwedaviaFlightAPI:
         api_key: str | None = None,
         api_key_secondary: str | None = None,
         api_counter: APICallCounter | None = None,
+        rate_limiter: RateLimiter | None = None,
+        single_flight: SingleFlight | None = None,
+        response_cache: ResponseCache | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        string_interner: StringInterner | None = None,
     ) -> None:
         """Initialize the API client."""
         self._session = session
         self._api_key = api_key
         self._api_key_secondary = api_key_secondary
         self._current_key = api_key  # Start with primary key
-        self._last_request_time = None
-        self._min_request_interval = 1  # Minimum 1 second between requests
         self._api_counter = api_counter
-
-    async def _rate_limit(self) -> None:
-        """Implement rate limiting."""
-        if self._last_request_time:
-            time_since_last = datetime.now() - self._last_request_time
-            if time_since_last.total_seconds() < self._min_request_interval:
-                await asyncio.sleep(
-                    self._min_request_interval - time_since_last.total_seconds()
-                )
-        self._last_request_time = datetime.now()
+        # Share the limiter between clients so all entries queue together
+        self._rate_limiter = rate_limiter or RateLimiter()
+        # Share in-flight requests between clients to avoid duplicate calls
+        self._single_flight = single_flight or SingleFlight()
+        # Share decoded flight lists between clients and refreshes
+        self._response_cache = response_cache or ResponseCache()
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._retries_left = self._retry_policy.budget_per_cycle
+        # Share outage detection between clients
+        self._circuit_breaker = circuit_breaker or CircuitBreaker()
+        # Share repeated texts between flight records
+        self._string_interner = string_interner or StringInterner()
+        # Bound the number of concurrent requests from this client
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
 
     async def _request(
         self,
         endpoint: str,
         params: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
-        """Make a request to the Swedavia API."""
-        await self._rate_limit()
+        """Make a request, sharing it with identical in-flight requests."""
+        return (await self._request_full(endpoint, params)).payload
+
+    async def _request_full(
+        self,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        validators: tuple[str | None, str | None] | None = None,
+    ) -> _APIResponse:
+        """Make a request and return the response with its metadata."""
+        key = (endpoint, tuple(sorted((params or {}).items())), validators)
+        return await self._single_flight.async_run(
+            key, lambda: self._do_request_with_retry(endpoint, params, validators)
+        )
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """Return the circuit breaker guarding this client."""
+        return self._circuit_breaker
+
+    @property
+    def string_interner(self) -> StringInterner:
+        """Return the interner used when building flight records."""
+        return self._string_interner
+
+    def reset_retry_budget(self) -> None:
+        """Start a new update cycle with a full retry budget."""
+        self._retries_left = self._retry_policy.budget_per_cycle
+
+    def _consume_retry(self) -> bool:
+        """Take one retry from the budget if quota allows it."""
+        if self._retries_left <= 0:
+            return False
+        if (
+            self._api_counter
+            and self._api_counter.get_remaining() <= RETRY_RESERVE_CALLS
+        ):
+            return False
+        self._retries_left -= 1
+        return True
+
+    async def _do_request_with_retry(
+        self,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        validators: tuple[str | None, str | None] | None = None,
+    ) -> _APIResponse:
+        """Make a request, retrying transient errors with backoff.
+
+        Fails fast while the circuit breaker is open. Outage-type errors
+        left after retrying count as breaker failures (429 does not).
+        """
+        breaker = self._circuit_breaker
+        if not await breaker.async_allow_request(self._async_probe):
+            raise SwedaviaAPICircuitOpenError(
+                "Swedavia API unavailable, circuit breaker is open "
+                f"(next probe in {int(breaker.seconds_until_probe())} seconds)"
+            )
+
+        attempt = 0
+        while True:
+            try:
+                response = await self._do_request(endpoint, params, validators)
+            except RETRYABLE_ERRORS as err:
+                attempt += 1
+                delay = None
+                if attempt < self._retry_policy.max_attempts:
+                    delay = self._retry_policy.backoff(
+                        attempt, getattr(err, "retry_after", None)
+                    )
+                if delay is None or not self._consume_retry():
+                    # Rate limiting means the API is up, not an outage
+                    if not isinstance(err, SwedaviaAPIRateLimitError):
+                        breaker.record_failure(err)
+                    raise
+                _LOGGER.debug(
+                    "Retrying %s in %.1f seconds (attempt %d): %s",
+                    endpoint,
+                    delay,
+                    attempt + 1,
+                    err,
+                )
+                await asyncio.sleep(delay)
+            else:
+                breaker.record_success()
+                return response
+
+    async def _do_request(
+        self,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        validators: tuple[str | None, str | None] | None = None,
+        switch_key: bool = True,
+    ) -> _APIResponse:
+        """Make a request to the Swedavia API.
+
+        With validators the request is conditional, and a 304 answer is
+        returned as a response with not_modified set and no payload. A 401
+        answer switches to the secondary key, unless switch_key is False.
+        """
+        await self._rate_limiter.async_acquire(endpoint)
 
         # Increment API counter
         if self._api_counter:
@@ -73,6 +481,7 @@ class SwedaviaFlightAPI:
         url = f"{API_BASE_URL}/{endpoint}"
         headers = {
             "Accept": "application/json",
+            "Accept-Encoding": ACCEPT_ENCODING,
             "User-Agent": "HomeAssistant-SwedaviaFlights/1.0",
         }
         
@@ -80,6 +489,14 @@ class SwedaviaFlightAPI:
         if self._current_key:
             headers["Ocp-Apim-Subscription-Key"] = self._current_key
 
+        # Revalidate a cached response instead of downloading it again
+        if validators:
+            etag, last_modified = validators
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
         _LOGGER.debug("Requesting %s with params %s", url, params)
 
         try:
@@ -90,7 +507,8 @@ class SwedaviaFlightAPI:
                     if response.status == 401:
                         # Invalid API key - try secondary key if available
                         if (
-                            self._api_key_secondary
+                            switch_key
+                            and self._api_key_secondary
                             and self._current_key != self._api_key_secondary
                         ):
                             _LOGGER.warning(
@@ -100,14 +518,17 @@ class SwedaviaFlightAPI:
                             headers["Ocp-Apim-Subscription-Key"] = self._current_key
                             
                             # Retry with secondary key
+                            await self._rate_limiter.async_acquire(endpoint)
                             async with self._session.get(
                                 url, headers=headers, params=params
                             ) as retry_response:
                                 if retry_response.status == 401:
-                                    raise SwedaviaAPIError(
+                                    raise SwedaviaAPIAuthError(
                                         "API authentication failed with both primary and secondary keys. "
                                         "Please update your API keys from https://apideveloper.swedavia.se/"
                                     )
+                                if retry_response.status == 304:
+                                    return _APIResponse({}, not_modified=True)
                                 if retry_response.status != 200 and retry_response.status != 204:
                                     text = await retry_response.text()
                                     _LOGGER.error(
@@ -115,28 +536,38 @@ class SwedaviaFlightAPI:
                                         retry_response.status,
                                         text,
                                     )
-                                    raise SwedaviaAPIError(
+                                    error = (
+                                        SwedaviaAPIServerError
+                                        if retry_response.status >= 500
+                                        else SwedaviaAPIError
+                                    )
+                                    raise error(
                                         f"API request failed with status {retry_response.status}"
                                     )
                                 
                                 if retry_response.status == 204:
-                                    return {}
+                                    return _APIResponse({})
                                 
-                                return await retry_response.json()
+                                return await self._read_payload(retry_response)
                         else:
-                            raise SwedaviaAPIError(
+                            raise SwedaviaAPIAuthError(
                                 "API authentication failed. Invalid subscription key. "
                                 "Please update your API key from https://apideveloper.swedavia.se/"
                             )
                     
                     if response.status == 429:
                         raise SwedaviaAPIRateLimitError(
-                            "API rate limit exceeded"
+                            "API rate limit exceeded",
+                            parse_retry_after(response.headers.get("Retry-After")),
                         )
                     
+                    if response.status == 304:
+                        # Not modified - the cached payload is still valid
+                        return _APIResponse({}, not_modified=True)
+                    
                     if response.status == 204:
                         # No content - no flights available
-                        return {}
+                        return _APIResponse({})
                     
                     if response.status != 200:
                         text = await response.text()
@@ -145,11 +576,16 @@ class SwedaviaFlightAPI:
                             response.status,
                             text,
                         )
-                        raise SwedaviaAPIError(
+                        error = (
+                            SwedaviaAPIServerError
+                            if response.status >= 500
+                            else SwedaviaAPIError
+                        )
+                        raise error(
                             f"API request failed with status {response.status}"
                         )
 
-                    return await response.json()
+                    return await self._read_payload(response)
 
         except asyncio.TimeoutError as err:
             raise SwedaviaAPIConnectionError(
@@ -160,105 +596,268 @@ class SwedaviaFlightAPI:
                 f"Error connecting to Swedavia API: {err}"
             ) from err
 
+    async def _read_payload(self, response: aiohttp.ClientResponse) -> _APIResponse:
+        """Decode a JSON response body and keep its size and validators.
+
+        orjson decodes the body straight from bytes when available. An
+        empty body decodes to an empty payload.
+        """
+        body = await response.read()
+        if not body.strip():
+            payload: dict[str, Any] = {}
+        else:
+            try:
+                payload = json_loads(body)
+            except ValueError as err:
+                raise SwedaviaAPIDecodeError(
+                    f"Invalid JSON from Swedavia API: {err}"
+                ) from err
+        return _APIResponse(
+            payload,
+            len(body),
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+
+    async def _get_flight_list(
+        self, airport_iata: str, direction: str, date_str: str
+    ) -> dict[str, Any]:
+        """Get a flight list for one airport, direction and date via the cache."""
+        cache = self._response_cache
+        key = (airport_iata, direction, date_str)
+        if (cached := cache.get(key)) is not None:
+            return cached
+
+        endpoint = f"{airport_iata}/{direction}/{date_str}"
+        ttl = cache_ttl_for_date(date_str)
+
+        if validators := cache.get_validators(key):
+            cache.conditional_requests += 1
+            response = await self._request_full(endpoint, validators=validators)
+            if response.not_modified:
+                if (payload := cache.revalidated(key, ttl)) is not None:
+                    _LOGGER.debug("%s not modified, reusing cached payload", endpoint)
+                    return payload
+                # Evicted while revalidating, download it again
+                response = await self._request_full(endpoint)
+        else:
+            response = await self._request_full(endpoint)
+
+        cache.put(
+            key,
+            response.payload,
+            response.size,
+            ttl,
+            response.etag,
+            response.last_modified,
+        )
+        return response.payload
+
     async def get_arrivals(
         self, airport_iata: str, date: str | None = None
     ) -> dict[str, Any]:
         """Get arrivals for an airport."""
         if date is None:
-            date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+            date = local_today().isoformat()
 
-        endpoint = f"{airport_iata}/arrivals/{date}"
-        return await self._request(endpoint)
+        return await self._get_flight_list(airport_iata, "arrivals", date)
 
     async def get_departures(
         self, airport_iata: str, date: str | None = None
     ) -> dict[str, Any]:
         """Get departures for an airport."""
         if date is None:
-            date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+            date = local_today().isoformat()
 
-        endpoint = f"{airport_iata}/departures/{date}"
-        return await self._request(endpoint)
+        return await self._get_flight_list(airport_iata, "departures", date)
 
-    async def get_flights_by_date_range(
+    async def query_flights(
         self,
-        airport_iata: str,
-        flight_type: str,
-        hours_back: int = 0,
-        hours_ahead: int = 24,
-    ) -> list[dict[str, Any]]:
-        """Get flights within a date range."""
-        flights = []
-        now = datetime.now(timezone.utc)
-        today = now.date()
-        
-        # Calculate date range
-        start_date = today - timedelta(hours=hours_back) if hours_back > 0 else today
-        end_date = today + timedelta(hours=hours_ahead) if hours_ahead > 0 else today
-        
-        # Get flights for each date in range
-        current_date = start_date
-        while current_date <= end_date:
-            date_str = current_date.strftime("%Y-%m-%d")
-            
-            try:
+        filter_expr: str | None = None,
+        continuation_token: str | None = None,
+        count: int = QUERY_PAGE_SIZE,
+    ) -> dict[str, Any]:
+        """Query flights with an OData filter and/or a continuation token.
+
+        Without a token the API returns the flights matching the filter.
+        With a token it returns only flights updated since the call that
+        produced the token. The response carries a new token either way.
+        """
+        params: dict[str, Any] = {"count": count}
+        if filter_expr:
+            params["filter"] = filter_expr
+        if continuation_token:
+            params["continuationtoken"] = continuation_token
+
+        return await self._request("query", params)
+
+    async def get_flights_for_date(
+        self, airport_iata: str, flight_type: str, date_str: str
+    ) -> list[dict[str, Any]] | None:
+        """Get flights for one date, returning None on failure."""
+        try:
+            async with self._semaphore:
                 if flight_type == "arrivals":
                     data = await self.get_arrivals(airport_iata, date_str)
                 else:
                     data = await self.get_departures(airport_iata, date_str)
-                
-                if data and "flights" in data:
-                    flights.extend(data["flights"])
-                    
-            except SwedaviaAPIError as err:
-                _LOGGER.warning(
-                    "Failed to get %s for %s on %s: %s",
-                    flight_type,
-                    airport_iata,
-                    date_str,
-                    err,
-                )
-            
-            current_date += timedelta(days=1)
-        
-        # Filter by time window
-        now = datetime.now(timezone.utc)
-        filtered_flights = []
-        
-        for flight in flights:
-            # Get the relevant time field
-            if flight_type == "arrivals":
-                time_data = flight.get("arrivalTime", {})
-            else:
-                time_data = flight.get("departureTime", {})
-            
-            # Try to get the most accurate time
-            time_str = (
-                time_data.get("actualUtc")
-                or time_data.get("estimatedUtc")
-                or time_data.get("scheduledUtc")
+        except SwedaviaAPICircuitOpenError:
+            raise
+        except SwedaviaAPIError as err:
+            _LOGGER.warning(
+                "Failed to get %s for %s on %s: %s",
+                flight_type,
+                airport_iata,
+                date_str,
+                err,
             )
-            
-            if time_str:
-                try:
-                    flight_time = datetime.fromisoformat(
-                        time_str.replace("Z", "+00:00")
-                    )
-                    
-                    # Check if within time window
-                    time_diff = (flight_time - now).total_seconds() / 3600
-                    if -hours_back <= time_diff <= hours_ahead:
-                        filtered_flights.append(flight)
-                        
-                except (ValueError, AttributeError) as err:
-                    _LOGGER.debug("Failed to parse time %s: %s", time_str, err)
-        
-        return filtered_flights
+            return None
+
+        if data and "flights" in data:
+            return data["flights"]
+        return []
+
+    async def get_flights_in_window(
+        self,
+        airport_iata: str,
+        flight_type: str,
+        hours_back: int,
+        hours_ahead: int,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Get arrival and departure API objects within the time window via /query.
+
+        The window is applied by the server on the estimated time, so only
+        flights in the window are downloaded. The exact window, on the most
+        accurate time, is left to the coordinator.
+        """
+        now = datetime.now(timezone.utc)
+        filter_expr = build_window_filter(
+            airport_iata,
+            flight_type,
+            now - timedelta(hours=hours_back),
+            now + timedelta(hours=hours_ahead),
+        )
+
+        items: list[dict[str, Any]] = []
+        token = None
+        while True:
+            response = await self.query_flights(filter_expr, token)
+            page = response.get("flights") or []
+            items.extend(page)
+            token = response.get("continuationtoken")
+
+            # A full page means there may be more flights behind the token
+            if len(page) < QUERY_PAGE_SIZE or not token:
+                break
+
+        return {
+            FLIGHT_TYPE_ARRIVALS: [item["arrival"] for item in items if item.get("arrival")],
+            FLIGHT_TYPE_DEPARTURES: [
+                item["departure"] for item in items if item.get("departure")
+            ],
+        }
+
+    async def heartbeat(self) -> dict[str, Any]:
+        """Call the lightweight /heartBeat endpoint.
+
+        Bypasses the circuit breaker, retries and coalescing, as it is
+        used to probe the API. Never switches keys, as /heartBeat may
+        reject keys that are valid for the flight lists.
+        """
+        try:
+            return (await self._do_request("heartBeat", switch_key=False)).payload
+        except SwedaviaAPIDecodeError:
+            # Answered, but not with JSON - the API is still up
+            return {}
+
+    async def _async_probe(self) -> None:
+        """Probe whether the API is up again, for the circuit breaker.
+
+        Only timeouts, connection errors and 5xx answers count as down.
+        /heartBeat is internal to Swedavia and may answer 401, 403 or 404
+        to a subscription, which still shows the API is up. The probe
+        never switches keys.
+        """
+        try:
+            await self._do_request("heartBeat", switch_key=False)
+        except (SwedaviaAPIConnectionError, SwedaviaAPIServerError):
+            raise
+        except SwedaviaAPIError as err:
+            _LOGGER.debug("Probe answered with %s, API is up", err)
+
+    async def validate_connection(
+        self, airport_iata: str, flight_type: str = "departures"
+    ) -> bool:
+        """Validate the API connection and subscription key.
+
+        Uses the cheap /heartBeat endpoint. Any failure there, including a
+        rejected key, is inconclusive, and today's flight list for the
+        airport is fetched instead; it lands in the response cache, so a
+        coordinator sharing the cache gets it for its first refresh without
+        another call.
+        """
+        try:
+            await self.heartbeat()
+            return True
+        except SwedaviaAPIError as err:
+            # /heartBeat is internal to Swedavia and may reject valid keys,
+            # so only the flight list decides
+            _LOGGER.debug("Heartbeat unavailable, validating with flight list: %s", err)
 
-    async def validate_connection(self, airport_iata: str) -> bool:
-        """Validate the API connection and airport code."""
         try:
-            await self.get_departures(airport_iata)
+            if flight_type == "arrivals":
+                await self.get_arrivals(airport_iata)
+            else:
+                await self.get_departures(airport_iata)
             return True
         except SwedaviaAPIError:
             return False
+
+
+def build_query_filter(
+    airports: list[str],
+    flight_type: str,
+    dates: list[date],
+) -> str:
+    """Build an OData filter for the /query endpoint.
+
+    Dates are Swedish local dates, matching the "scheduled" field.
+    """
+    parts = []
+
+    airport_terms = [f"airport eq '{airport}'" for airport in sorted(airports)]
+    parts.append(
+        airport_terms[0] if len(airport_terms) == 1 else f"({' or '.join(airport_terms)})"
+    )
+
+    if flight_type != FLIGHT_TYPE_BOTH:
+        code = "A" if flight_type == FLIGHT_TYPE_ARRIVALS else "D"
+        parts.append(f"flightType eq '{code}'")
+
+    date_terms = [f"scheduled eq '{day.strftime('%y%m%d')}'" for day in sorted(dates)]
+    if date_terms:
+        parts.append(
+            date_terms[0] if len(date_terms) == 1 else f"({' or '.join(date_terms)})"
+        )
+
+    return " and ".join(parts)
+
+
+def build_window_filter(
+    airport: str,
+    flight_type: str,
+    start: datetime,
+    end: datetime,
+) -> str:
+    """Build an OData filter for flights estimated within a UTC time window."""
+    parts = [f"airport eq '{airport}'"]
+
+    if flight_type != FLIGHT_TYPE_BOTH:
+        direction = "A" if flight_type == FLIGHT_TYPE_ARRIVALS else "D"
+        parts.append(f"flightType eq '{direction}'")
+
+    parts.append(f"estimated ge '{start:%Y-%m-%dT%H:%M:%S}'")
+    parts.append(f"estimated le '{end:%Y-%m-%dT%H:%M:%S}'")
+
+    return " and ".join(parts)
+
@@ -120,6 +120,14 @@ class APICallCounter:
         
         return sum(1 for ts in self._call_timestamps if ts > cutoff_time)
 
+    def get_timestamps(self) -> list[float]:
+        """Get the times of the API calls in the last 30 days, oldest first."""
+        cutoff_time = (
+            datetime.now(timezone.utc) - timedelta(days=ROLLING_WINDOW_DAYS)
+        ).timestamp()
+
+        return [ts for ts in self._call_timestamps if ts > cutoff_time]
+
     def get_remaining(self) -> int:
         """Get the number of remaining API calls before hitting the limit."""
         return max(0, API_CALL_LIMIT - self.get_count())
@@ -0,0 +1,146 @@
+"""Batched /query fetching shared by all delta sync entries."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant
+
+from .api import build_query_filter
+from .const import (
+    CONF_AIRPORT,
+    CONF_FETCH_MODE,
+    CONF_FLIGHT_TYPE,
+    CONF_HOURS_AHEAD,
+    CONF_HOURS_BACK,
+    DEFAULT_FETCH_MODE,
+    DOMAIN,
+    FETCH_MODE_DELTA,
+    FLIGHT_TYPE_ARRIVALS,
+    FLIGHT_TYPE_BOTH,
+    FLIGHT_TYPE_DEPARTURES,
+)
+from .date_planner import dates_in_window
+from .delta_sync import DeltaSync
+
+if TYPE_CHECKING:
+    from .coordinator import SwedaviaFlightCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+BATCH_STORAGE_KEY = "batch"
+
+# A sync younger than this fraction of the requester's interval is reused
+REUSE_FRACTION = 0.9
+
+
+class BatchFetcher:
+    """Fetch flights for every delta sync entry with a single /query filter.
+
+    One filter covers the airports, flight types and dates of every delta
+    sync config entry, including those not set up yet, so entries being
+    loaded or reloaded do not change it. The result is split by airport
+    and pushed to every registered coordinator.
+    Their own queued updates then reuse the fresh result, so each update
+    interval costs about one call (plus pagination) no matter how many
+    airports are configured.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the batch fetcher."""
+        self._hass = hass
+        self._coordinators: dict[str, SwedaviaFlightCoordinator] = {}
+        self._delta_sync = DeltaSync(hass, BATCH_STORAGE_KEY)
+        self._lock = asyncio.Lock()
+        self._last_sync: float | None = None
+        self._last_filter: str | None = None
+
+    def register(self, coordinator: SwedaviaFlightCoordinator) -> None:
+        """Register a coordinator to be served by the batch."""
+        self._coordinators[coordinator.entry.entry_id] = coordinator
+
+    def unregister(self, entry_id: str) -> None:
+        """Stop serving a coordinator."""
+        self._coordinators.pop(entry_id, None)
+
+    def _build_filter(self) -> str:
+        """Build one filter covering every delta sync config entry."""
+        airports: set[str] = set()
+        dates = set()
+        needs_arrivals = needs_departures = False
+
+        for entry in self._hass.config_entries.async_entries(DOMAIN):
+            if (
+                entry.disabled_by
+                or entry.data.get(CONF_FETCH_MODE, DEFAULT_FETCH_MODE)
+                != FETCH_MODE_DELTA
+            ):
+                continue
+            airports.add(entry.data[CONF_AIRPORT])
+            dates.update(
+                dates_in_window(
+                    entry.data.get(CONF_HOURS_BACK, 2),
+                    entry.data.get(CONF_HOURS_AHEAD, 24),
+                )
+            )
+            flight_type = entry.data.get(CONF_FLIGHT_TYPE, FLIGHT_TYPE_BOTH)
+            if flight_type in (FLIGHT_TYPE_ARRIVALS, FLIGHT_TYPE_BOTH):
+                needs_arrivals = True
+            if flight_type in (FLIGHT_TYPE_DEPARTURES, FLIGHT_TYPE_BOTH):
+                needs_departures = True
+
+        if needs_arrivals and needs_departures:
+            flight_type = FLIGHT_TYPE_BOTH
+        elif needs_arrivals:
+            flight_type = FLIGHT_TYPE_ARRIVALS
+        else:
+            flight_type = FLIGHT_TYPE_DEPARTURES
+
+        return build_query_filter(list(airports), flight_type, list(dates))
+
+    async def async_refresh(self, requester: SwedaviaFlightCoordinator) -> None:
+        """Sync the shared flight set on behalf of a coordinator.
+
+        If another coordinator synced recently with the same filter, its
+        result is reused and no call is made.
+        """
+        async with self._lock:
+            interval = requester.refresh_interval
+            filter_expr = self._build_filter()
+            if (
+                self._last_sync is not None
+                and filter_expr == self._last_filter
+                and time.monotonic() - self._last_sync
+                < interval.total_seconds() * REUSE_FRACTION
+            ):
+                _LOGGER.debug(
+                    "Reusing batch result for %s (synced %.0f seconds ago)",
+                    requester.airport,
+                    time.monotonic() - self._last_sync,
+                )
+                return
+
+            changed = await self._delta_sync.async_sync(requester.api, filter_expr)
+            self._last_sync = time.monotonic()
+            self._last_filter = filter_expr
+
+        _LOGGER.debug(
+            "Batch sync for %d entries: %d changed flights",
+            len(self._coordinators),
+            changed,
+        )
+
+        # Hand the split result to every other entry
+        for entry_id, coordinator in self._coordinators.items():
+            if entry_id != requester.entry.entry_id:
+                coordinator.async_set_updated_data(coordinator.build_delta_data())
+
+    def get_flights(self, airport: str, flight_type: str) -> list[dict[str, Any]]:
+        """Get flights of one type for an airport from the shared set."""
+        return self._delta_sync.get_flights(airport, flight_type)
+
+    async def async_remove(self) -> None:
+        """Remove persisted state."""
+        await self._delta_sync.async_remove()
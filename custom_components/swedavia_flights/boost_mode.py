@@ -8,6 +8,8 @@ from typing import Any
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.storage import Store
 
+from .const import FLIGHT_TYPE_BOTH
+
 _LOGGER = logging.getLogger(__name__)
 
 STORAGE_VERSION = 1
@@ -27,6 +29,8 @@ class BoostMode:
         self._hass = hass
         self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
         self._active_boosts: dict[str, datetime] = {}
+        # Flight type each boost applies to
+        self._boost_directions: dict[str, str] = {}
         self._initialized = False
 
     async def async_initialize(self) -> None:
@@ -36,6 +40,7 @@ class BoostMode:
 
         data = await self._store.async_load()
         if data and "active_boosts" in data:
+            directions = data.get("directions", {})
             # Convert stored timestamps back to datetime objects
             now = datetime.now(timezone.utc)
             for entry_id, timestamp_str in data["active_boosts"].items():
@@ -44,6 +49,9 @@ class BoostMode:
                     # Only restore if boost is still active
                     if boost_end > now:
                         self._active_boosts[entry_id] = boost_end
+                        self._boost_directions[entry_id] = directions.get(
+                            entry_id, FLIGHT_TYPE_BOTH
+                        )
                         _LOGGER.info(
                             "Restored active boost for %s until %s",
                             entry_id,
@@ -61,17 +69,24 @@ class BoostMode:
             "active_boosts": {
                 entry_id: boost_end.isoformat()
                 for entry_id, boost_end in self._active_boosts.items()
-            }
+            },
+            "directions": dict(self._boost_directions),
         }
         await self._store.async_save(data)
 
-    async def activate_boost(self, entry_id: str, duration_hours: int | None = None) -> dict[str, Any]:
+    async def activate_boost(
+        self,
+        entry_id: str,
+        duration_hours: int | None = None,
+        direction: str = FLIGHT_TYPE_BOTH,
+    ) -> dict[str, Any]:
         """
         Activate boost mode for a specific config entry.
         
         Args:
             entry_id: The config entry ID to boost
             duration_hours: Duration in hours (default: 4 hours)
+            direction: Flight type to boost, arrivals, departures or both
         
         Returns:
             dict with boost information
@@ -83,24 +98,30 @@ class BoostMode:
         boost_end = datetime.now(timezone.utc) + timedelta(hours=duration)
         
         self._active_boosts[entry_id] = boost_end
+        self._boost_directions[entry_id] = direction
         await self._save()
 
         # Calculate expected API calls
         updates_during_boost = int((duration * 3600) / BOOST_INTERVAL_SECONDS)
+        # Average estimate, one flight type makes half the calls
+        calls_per_update = 3 if direction == FLIGHT_TYPE_BOTH else 1.5
+        estimated_calls = int(updates_during_boost * calls_per_update)
         
         _LOGGER.warning(
-            "⚡ BOOST MODE ACTIVATED for entry %s\n"
+            "⚡ BOOST MODE ACTIVATED for entry %s (%s)\n"
             "Duration: %d hours\n"
             "Update interval: %d seconds (2 minutes)\n"
             "Expected updates: ~%d\n"
-            "Expected API calls: ~%d (2-4 calls per update)\n"
+            "Expected API calls: ~%d (%s calls per update)\n"
             "Boost ends at: %s UTC\n"
             "⚠️ WARNING: This will significantly increase API usage!",
             entry_id,
+            direction,
             duration,
             BOOST_INTERVAL_SECONDS,
             updates_during_boost,
-            updates_during_boost * 3,  # Average estimate
+            estimated_calls,
+            "2-4" if direction == FLIGHT_TYPE_BOTH else "1-2",
             boost_end.strftime("%Y-%m-%d %H:%M:%S"),
         )
 
@@ -108,8 +129,9 @@ class BoostMode:
             "entry_id": entry_id,
             "boost_end": boost_end.isoformat(),
             "duration_hours": duration,
+            "direction": direction,
             "interval_seconds": BOOST_INTERVAL_SECONDS,
-            "estimated_calls": updates_during_boost * 3,
+            "estimated_calls": estimated_calls,
         }
 
     async def deactivate_boost(self, entry_id: str) -> bool:
@@ -124,6 +146,7 @@ class BoostMode:
 
         if entry_id in self._active_boosts:
             del self._active_boosts[entry_id]
+            self._boost_directions.pop(entry_id, None)
             await self._save()
             
             _LOGGER.info("Boost mode deactivated for entry %s", entry_id)
@@ -142,6 +165,7 @@ class BoostMode:
         if boost_end <= now:
             # Boost has expired, remove it
             del self._active_boosts[entry_id]
+            self._boost_directions.pop(entry_id, None)
             # Save asynchronously (fire and forget)
             self._hass.async_create_task(self._save())
             _LOGGER.info("Boost mode expired for entry %s", entry_id)
@@ -149,14 +173,22 @@ class BoostMode:
 
         return True
 
-    def get_boost_interval(self, entry_id: str) -> int | None:
+    def get_boost_interval(
+        self, entry_id: str, direction: str = FLIGHT_TYPE_BOTH
+    ) -> int | None:
         """
-        Get the boost interval if boost is active.
+        Get the boost interval if boost is active for a flight type.
+        
+        A boost of both flight types applies to either, and a boost of one
+        flight type to updates of that type or of both.
         
         Returns:
             Interval in seconds if boost active, None otherwise
         """
-        if self.is_boost_active(entry_id):
+        if not self.is_boost_active(entry_id):
+            return None
+        boosted = self._boost_directions.get(entry_id, FLIGHT_TYPE_BOTH)
+        if FLIGHT_TYPE_BOTH in (boosted, direction) or boosted == direction:
             return BOOST_INTERVAL_SECONDS
         return None
 
@@ -174,6 +206,7 @@ class BoostMode:
             "boost_end": boost_end.isoformat(),
             "remaining_seconds": int(remaining.total_seconds()),
             "remaining_minutes": int(remaining.total_seconds() / 60),
+            "direction": self._boost_directions.get(entry_id, FLIGHT_TYPE_BOTH),
             "interval_seconds": BOOST_INTERVAL_SECONDS,
         }
 
@@ -205,6 +238,7 @@ class BoostMode:
 
         for entry_id in expired:
             del self._active_boosts[entry_id]
+            self._boost_directions.pop(entry_id, None)
             _LOGGER.info("Cleaned up expired boost for entry %s", entry_id)
 
         if expired:
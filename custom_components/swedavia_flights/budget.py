@@ -0,0 +1,131 @@
+"""Feedback control of update intervals from the recorded API usage."""
+from __future__ import annotations
+
+from bisect import bisect_right
+from datetime import datetime, timezone
+import logging
+import time
+from typing import Any, TYPE_CHECKING
+
+from .api_counter import API_CALL_LIMIT, ROLLING_WINDOW_DAYS
+
+if TYPE_CHECKING:
+    from .api_counter import APICallCounter
+
+_LOGGER = logging.getLogger(__name__)
+
+DAY = 86400
+
+# Rolling 30-day usage to steer towards, with room for manual calls
+TARGET_USAGE = int(API_CALL_LIMIT * 0.85)
+
+# Throttle factor applied to every update interval
+MIN_THROTTLE = 0.5
+MAX_THROTTLE = 4.0
+
+CONTROL_PERIOD = 900  # Seconds between adjustments
+MIN_OBSERVED = 3600  # Usage history needed before adjusting
+TREND_DAYS = 7
+
+
+class BudgetController:
+    """Steer all update intervals so projected usage lands on the target.
+
+    The burn rate of the last 24 hours is compared with the rate the
+    target allows. That rate is the target spread over the rolling
+    window, but never more than fits under the target tomorrow, once
+    the calls leaving the window have been counted.
+
+    The burn rate was made at the factors applied over the same 24 hours,
+    tracked as a moving average. Scaling that average by the ratio of
+    the rates gives the factor that would have hit the target, and the
+    throttle factor moves half way there on each step. Comparing against
+    the applied average rather than the current factor keeps the slow
+    24-hour measurement from winding the factor up.
+    """
+
+    def __init__(self, api_counter: APICallCounter) -> None:
+        """Initialize the controller."""
+        self._api_counter = api_counter
+        self._throttle = 1.0
+        # Moving average of the factor over about the last 24 hours
+        self._applied = 1.0
+        self._last_adjusted: float | None = None
+        self._stats: dict[str, Any] = {}
+
+    @property
+    def throttle(self) -> float:
+        """Get the factor to multiply update intervals with."""
+        self.update()
+        return self._throttle
+
+    def update(self) -> None:
+        """Recompute the projection and move the throttle factor, if due."""
+        now = time.time()
+        if self._last_adjusted is not None:
+            elapsed = now - self._last_adjusted
+            if elapsed < CONTROL_PERIOD:
+                return
+            self._applied += (self._throttle - self._applied) * min(elapsed / DAY, 1)
+        self._last_adjusted = now
+
+        # Oldest first, as recorded
+        timestamps = self._api_counter.get_timestamps()
+        count = len(timestamps)
+        oldest = timestamps[0] if timestamps else now
+
+        def calls_after(cutoff: float) -> int:
+            return count - bisect_right(timestamps, cutoff)
+
+        observed = min(DAY, now - oldest)
+        burn_rate = calls_after(now - DAY) * DAY / observed if observed else 0.0
+
+        trend_span = min(TREND_DAYS * DAY, now - oldest)
+        weekly_rate = (
+            calls_after(now - TREND_DAYS * DAY) * DAY / trend_span if trend_span else 0.0
+        )
+
+        # Calls that can be made in the next 24 hours without the rolling
+        # count exceeding the target then
+        window_start = now - ROLLING_WINDOW_DAYS * DAY
+        headroom = max(TARGET_USAGE - calls_after(window_start + DAY), 0)
+        target_rate = max(min(TARGET_USAGE / ROLLING_WINDOW_DAYS, headroom), 1.0)
+
+        if observed >= MIN_OBSERVED:
+            wanted = self._applied * burn_rate / target_rate
+            # Go half way (on a log scale) towards the wanted factor
+            throttle = (self._throttle * max(wanted, MIN_THROTTLE)) ** 0.5
+            throttle = min(max(throttle, MIN_THROTTLE), MAX_THROTTLE)
+            if round(throttle, 2) != round(self._throttle, 2):
+                _LOGGER.debug(
+                    "Burn rate %.0f calls/day vs %.0f allowed, throttle %.2f -> %.2f",
+                    burn_rate,
+                    target_rate,
+                    self._throttle,
+                    throttle,
+                )
+            self._throttle = throttle
+
+        # Day by day over one window, as old calls leave it and new ones are made
+        limit_reached = None
+        if burn_rate:
+            for day in range(ROLLING_WINDOW_DAYS + 1):
+                if calls_after(window_start + day * DAY) + burn_rate * day >= API_CALL_LIMIT:
+                    limit_reached = datetime.fromtimestamp(
+                        now + day * DAY, timezone.utc
+                    ).isoformat()
+                    break
+
+        self._stats = {
+            "burn_rate_per_day": round(burn_rate, 1),
+            "burn_rate_trend": round(burn_rate / weekly_rate, 2) if weekly_rate else None,
+            "target_calls_30_days": TARGET_USAGE,
+            "projected_calls_30_days": int(burn_rate * ROLLING_WINDOW_DAYS),
+            "projected_limit_reached": limit_reached,
+            "throttle_factor": round(self._throttle, 2),
+        }
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get the usage projection and the throttle factor."""
+        self.update()
+        return dict(self._stats)
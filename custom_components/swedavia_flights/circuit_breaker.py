@@ -0,0 +1,127 @@
+"""Circuit breaker for the Swedavia API."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+import logging
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+FAILURE_THRESHOLD = 3  # Consecutive failed requests before opening
+OPEN_SECONDS = 120  # First wait before probing
+MAX_OPEN_SECONDS = 1800  # Cap for the doubling wait after failed probes
+MAX_TRANSITIONS = 10  # Transitions kept for the sensor
+
+
+class CircuitBreaker:
+    """Stop calling the API during an outage and probe it cheaply.
+
+    Closed: requests pass, consecutive failures are counted. Open: requests
+    fail fast until the wait is over. Half-open: one cheap probe (the
+    /heartBeat endpoint, where any answer but a 5xx means the API is up)
+    decides whether to close again or to stay open with a doubled wait.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the circuit breaker."""
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.last_failure: str | None = None
+        self._open_seconds = OPEN_SECONDS
+        self._opened_at = 0.0
+        self._probe_lock = asyncio.Lock()
+        self._transitions: deque[dict[str, str]] = deque(maxlen=MAX_TRANSITIONS)
+
+    def _transition(self, state: str, reason: str) -> None:
+        """Change state and remember the transition."""
+        if state == self.state:
+            return
+        _LOGGER.log(
+            logging.WARNING if state == STATE_OPEN else logging.INFO,
+            "Swedavia API circuit breaker %s -> %s: %s",
+            self.state,
+            state,
+            reason,
+        )
+        self._transitions.append(
+            {
+                "from": self.state,
+                "to": state,
+                "at": datetime.now(timezone.utc).isoformat(),
+                "reason": reason,
+            }
+        )
+        self.state = state
+        if state == STATE_OPEN:
+            self._opened_at = time.monotonic()
+
+    def seconds_until_probe(self) -> float:
+        """Seconds left before an open breaker may probe."""
+        if self.state != STATE_OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self._open_seconds - time.monotonic())
+
+    async def async_allow_request(
+        self, probe: Callable[[], Awaitable[Any]]
+    ) -> bool:
+        """Check whether a request may be made, probing when due.
+
+        Only one probe runs at a time; concurrent callers wait for its
+        outcome instead of probing themselves.
+        """
+        if self.state == STATE_CLOSED:
+            return True
+        if self.seconds_until_probe() > 0:
+            return False
+
+        async with self._probe_lock:
+            # Another caller may have probed while we waited for the lock
+            if self.state == STATE_CLOSED:
+                return True
+            if self.seconds_until_probe() > 0:
+                return False
+
+            self._transition(STATE_HALF_OPEN, "probing /heartBeat")
+            try:
+                await probe()
+            except Exception as err:  # pylint: disable=broad-except
+                self._open_seconds = min(self._open_seconds * 2, MAX_OPEN_SECONDS)
+                self.last_failure = str(err)
+                self._transition(STATE_OPEN, f"probe failed: {err}")
+                return False
+
+            self.record_success()
+            return True
+
+    def record_success(self) -> None:
+        """Record a successful request."""
+        self.consecutive_failures = 0
+        self._open_seconds = OPEN_SECONDS
+        self._transition(STATE_CLOSED, "request succeeded")
+
+    def record_failure(self, err: Exception) -> None:
+        """Record a failed request and open after too many in a row."""
+        self.consecutive_failures += 1
+        self.last_failure = str(err)
+        if self.state == STATE_CLOSED and self.consecutive_failures >= FAILURE_THRESHOLD:
+            self._transition(
+                STATE_OPEN, f"{self.consecutive_failures} consecutive failures"
+            )
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "last_failure": self.last_failure,
+            "seconds_until_probe": int(self.seconds_until_probe()),
+            "transitions": list(self._transitions),
+        }
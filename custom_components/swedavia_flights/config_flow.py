@@ -9,38 +9,68 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import homeassistant.helpers.config_validation as cv
 
-from .api import SwedaviaAPIError, SwedaviaFlightAPI
+from .api import ResponseCache, SwedaviaAPIError, SwedaviaFlightAPI
 from .const import (
     CONF_API_KEY,
     CONF_API_KEY_SECONDARY,
     CONF_AIRPORT,
+    CONF_FETCH_MODE,
     CONF_FLIGHT_TYPE,
     CONF_HOURS_AHEAD,
     CONF_HOURS_BACK,
+    DEFAULT_FETCH_MODE,
     DOMAIN,
+    FETCH_MODE_DATE,
+    FETCH_MODE_DELTA,
+    FETCH_MODE_WINDOW,
     FLIGHT_TYPE_ARRIVALS,
     FLIGHT_TYPE_BOTH,
     FLIGHT_TYPE_DEPARTURES,
     SWEDISH_AIRPORTS,
 )
+from .session import async_get_session
 
 _LOGGER = logging.getLogger(__name__)
 
+FETCH_MODE_OPTIONS = {
+    FETCH_MODE_DATE: "Hela dagar per datum",
+    FETCH_MODE_DELTA: "Deltasynk (endast ändrade flyg)",
+    FETCH_MODE_WINDOW: "Tidsfönster (endast flyg i fönstret)",
+}
+
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect."""
-    session = async_get_clientsession(hass)
+    session = async_get_session(hass)
     api_key = data.get(CONF_API_KEY)
     api_key_secondary = data.get(CONF_API_KEY_SECONDARY)
-    api = SwedaviaFlightAPI(session, api_key, api_key_secondary)
+    shared = hass.data.setdefault(DOMAIN, {})
+    # Share the response cache with the entry about to be set up, so a
+    # flight list fetched here is reused by its first refresh
+    if "response_cache" not in shared:
+        shared["response_cache"] = ResponseCache()
+    api = SwedaviaFlightAPI(
+        session,
+        api_key,
+        api_key_secondary,
+        api_counter=shared.get("api_counter"),
+        rate_limiter=shared.get("rate_limiter"),
+        single_flight=shared.get("single_flight"),
+        response_cache=shared["response_cache"],
+        circuit_breaker=shared.get("circuit_breaker"),
+    )
 
     airport = data[CONF_AIRPORT]
+    flight_type = (
+        FLIGHT_TYPE_ARRIVALS
+        if data.get(CONF_FLIGHT_TYPE) == FLIGHT_TYPE_ARRIVALS
+        else FLIGHT_TYPE_DEPARTURES
+    )
 
     # Validate connection
-    if not await api.validate_connection(airport):
+    if not await api.validate_connection(airport, flight_type):
         raise SwedaviaAPIError("Cannot connect to Swedavia API")
 
     return {"title": f"Swedavia - {SWEDISH_AIRPORTS.get(airport, airport)}"}
@@ -166,6 +196,9 @@ class SwedaviaFlightConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 ),
                 vol.Optional(CONF_HOURS_BACK, default=2): cv.positive_int,
                 vol.Optional(CONF_HOURS_AHEAD, default=24): cv.positive_int,
+                vol.Optional(CONF_FETCH_MODE, default=DEFAULT_FETCH_MODE): vol.In(
+                    FETCH_MODE_OPTIONS
+                ),
             }
         )
 
@@ -214,6 +247,12 @@ class SwedaviaFlightOptionsFlow(config_entries.OptionsFlow):
                     CONF_HOURS_AHEAD,
                     default=self._config_entry.data.get(CONF_HOURS_AHEAD, 24),
                 ): cv.positive_int,
+                vol.Optional(
+                    CONF_FETCH_MODE,
+                    default=self._config_entry.data.get(
+                        CONF_FETCH_MODE, DEFAULT_FETCH_MODE
+                    ),
+                ): vol.In(FETCH_MODE_OPTIONS),
             }
         )
 
@@ -5,6 +5,9 @@ DOMAIN = "swedavia_flights"
 # API Configuration
 API_BASE_URL = "https://api.swedavia.se/flightinfo/v2"
 API_TIMEOUT = 30
+QUERY_PAGE_SIZE = 1000  # Max flights per /query call allowed by the API
+QUERY_MIN_INTERVAL = 2  # /query is limited to one call per two seconds
+SWEDAVIA_TIME_ZONE = "Europe/Stockholm"  # /query "scheduled" dates are Swedish local dates
 DEFAULT_SCAN_INTERVAL = 900  # 15 minutes (optimized for API limit of 10001 calls/30 days)
 
 # Configuration Keys
@@ -14,6 +17,18 @@ CONF_HOURS_AHEAD = "hours_ahead"
 CONF_HOURS_BACK = "hours_back"
 CONF_API_KEY = "api_key"
 CONF_API_KEY_SECONDARY = "api_key_secondary"
+CONF_FETCH_MODE = "fetch_mode"
+
+# Fetch Modes
+FETCH_MODE_DATE = "date"  # Full download of /{airport}/{type}/{date} every update
+FETCH_MODE_DELTA = "delta"  # Baseline + continuation token on /query
+FETCH_MODE_WINDOW = "window"  # Time window filtered by /query on the server
+DEFAULT_FETCH_MODE = FETCH_MODE_DATE
+
+# Whole days mode: seconds before a day is fetched again, by days from today.
+# Today (and earlier days in the look-back) is fetched every update.
+SEGMENT_REFRESH_TOMORROW = 3600  # Hourly
+SEGMENT_REFRESH_LATER = 6 * 3600  # A few times a day
 
 # Flight Types
 FLIGHT_TYPE_ARRIVALS = "arrivals"
@@ -42,6 +57,7 @@ SENSOR_TYPE_DEPARTURES = "departures"
 SENSOR_TYPE_BAGGAGE = "baggage"
 SENSOR_TYPE_KEY_ROTATION = "key_rotation"
 SENSOR_TYPE_API_COUNTER = "api_counter"
+SENSOR_TYPE_API_STATUS = "api_status"
 
 # Flight Status Codes
 FLIGHT_STATUS_SCHEDULED = "SCH"
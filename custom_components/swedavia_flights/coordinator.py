@@ -1,33 +1,71 @@
 """DataUpdateCoordinator for Swedavia Flight Information."""
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import partial
+from itertools import chain
 import logging
+import time
 from typing import Any, TYPE_CHECKING
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import SwedaviaAPIError, SwedaviaFlightAPI
+from .circuit_breaker import STATE_CLOSED
 from .const import (
     CONF_AIRPORT,
+    CONF_FETCH_MODE,
     CONF_FLIGHT_TYPE,
     CONF_HOURS_AHEAD,
     CONF_HOURS_BACK,
+    DEFAULT_FETCH_MODE,
     DOMAIN,
+    FETCH_MODE_DELTA,
+    FETCH_MODE_WINDOW,
     FLIGHT_TYPE_ARRIVALS,
     FLIGHT_TYPE_BOTH,
     FLIGHT_TYPE_DEPARTURES,
 )
-from .update_scheduler import calculate_update_schedule
+from .date_planner import dates_in_window, local_today, segment_max_age
+from .flight_index import FlightIndex, select_flights_in_window
+from .models import Flight, fingerprint_flights
+from .polling import PRIORITY_ACTIVE, PRIORITY_BACKGROUND, PRIORITY_BOOST
+from .update_scheduler import AdaptiveInterval, UpdateScheduler
 
 if TYPE_CHECKING:
+    from .batch_fetch import BatchFetcher
     from .boost_mode import BoostMode
+    from .budget import BudgetController
+    from .polling import PollingOrchestrator
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class _DaySegment:
+    """The flight records of one flight type and date, and when fetched."""
+
+    flights: list[Flight]
+    fetched: float
+
+
+@dataclass
+class _PollLoop:
+    """Refresh loop of one flight type, or of both updated together."""
+
+    flight_type: str
+    adaptive_interval: AdaptiveInterval
+    # Interval until the next update and its urgency
+    interval: timedelta
+    priority: int = PRIORITY_BACKGROUND
+    boosting: bool = False
+
+
 class SwedaviaFlightCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Class to manage fetching Swedavia flight data."""
 
@@ -44,93 +82,375 @@ class SwedaviaFlightCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self.flight_type = entry.data.get(CONF_FLIGHT_TYPE, FLIGHT_TYPE_BOTH)
         self.hours_ahead = entry.data.get(CONF_HOURS_AHEAD, 24)
         self.hours_back = entry.data.get(CONF_HOURS_BACK, 2)
+        self.fetch_mode = entry.data.get(CONF_FETCH_MODE, DEFAULT_FETCH_MODE)
+
+        # Calculate optimal update interval using smart scheduler
+        update_interval = UpdateScheduler(hass).calculate_optimal_interval(entry)
 
-        # Calculate optimal update interval and offset using smart scheduler
-        update_interval, update_offset = calculate_update_schedule(hass, entry)
-        
         _LOGGER.info(
-            "Initializing coordinator for %s with %d minute interval and %d second offset",
+            "Initializing coordinator for %s with %d minute interval",
             self.airport,
             int(update_interval.total_seconds() / 60),
-            int(update_offset.total_seconds()),
         )
 
+        # No timer of its own: the polling orchestrator runs the updates
         super().__init__(
             hass,
             _LOGGER,
             name=f"{DOMAIN}_{self.airport}",
-            update_interval=update_interval,
+            update_interval=None,
         )
-        
-        # Store offset for initial delay
-        self._update_offset = update_offset
-        self._normal_interval = update_interval
+
+        self._flight_types = [
+            flight_type
+            for flight_type in (FLIGHT_TYPE_ARRIVALS, FLIGHT_TYPE_DEPARTURES)
+            if self.flight_type in (flight_type, FLIGHT_TYPE_BOTH)
+        ]
+        # Arrivals and departures are refreshed on their own intervals,
+        # except in delta sync and window mode where one call serves both
+        if self.flight_type == FLIGHT_TYPE_BOTH and self.fetch_mode not in (
+            FETCH_MODE_DELTA,
+            FETCH_MODE_WINDOW,
+        ):
+            loop_types = self._flight_types
+        else:
+            loop_types = [self.flight_type]
+        self._loops = {
+            flight_type: _PollLoop(
+                flight_type, AdaptiveInterval(update_interval), update_interval
+            )
+            for flight_type in loop_types
+        }
+        # Loop of the update in progress; None updates all flight types
+        self._polling: _PollLoop | None = None
+        self._orchestrator: PollingOrchestrator | None = None
         self._boost_mode: BoostMode | None = None
+        self._budget_controller: BudgetController | None = None
+        self._batch_fetcher: BatchFetcher | None = None
+        # Whole days mode: flight lists by (flight type, date)
+        self._segments: dict[tuple[str, date], _DaySegment] = {}
+        self._indexes = {
+            FLIGHT_TYPE_ARRIVALS: FlightIndex(True, api.string_interner),
+            FLIGHT_TYPE_DEPARTURES: FlightIndex(False, api.string_interner),
+        }
+        # Fingerprint of the data entities last showed
+        self._fingerprint: int | None = None
+        self.suppressed_updates = 0
 
     def set_boost_mode(self, boost_mode: BoostMode) -> None:
         """Set the boost mode manager."""
         self._boost_mode = boost_mode
 
+    def set_budget_controller(self, budget_controller: BudgetController) -> None:
+        """Set the shared controller that throttles intervals to the call budget."""
+        self._budget_controller = budget_controller
+
+    @property
+    def refresh_interval(self) -> timedelta:
+        """Get the shortest interval until the next update of any loop."""
+        return min(loop.interval for loop in self._loops.values())
+
+    def set_orchestrator(self, orchestrator: PollingOrchestrator) -> None:
+        """Set the shared orchestrator and queue each refresh loop with it."""
+        self._orchestrator = orchestrator
+        for loop in self._loops.values():
+            orchestrator.register(
+                (self.entry.entry_id, loop.flight_type),
+                partial(self.async_poll, loop),
+                loop.interval.total_seconds() if self.data is not None else 0,
+            )
+
+    def unset_orchestrator(self) -> None:
+        """Stop the refresh loops."""
+        if self._orchestrator is not None:
+            for flight_type in self._loops:
+                self._orchestrator.unregister((self.entry.entry_id, flight_type))
+            self._orchestrator = None
+
+    async def async_poll(self, loop: _PollLoop) -> tuple[float, int]:
+        """Update one loop on behalf of the orchestrator.
+
+        Returns when to update it next and how urgently.
+        """
+        self._polling = loop
+        try:
+            await self.async_refresh()
+        finally:
+            self._polling = None
+        return loop.interval.total_seconds(), loop.priority
+
     async def async_request_refresh(self) -> None:
-        """Request a refresh and check for boost mode."""
-        # Check if boost mode is active and adjust interval
-        if self._boost_mode and self._boost_mode.is_boost_active(self.entry.entry_id):
-            boost_interval = self._boost_mode.get_boost_interval(self.entry.entry_id)
-            if boost_interval:
-                new_interval = timedelta(seconds=boost_interval)
-                if self.update_interval != new_interval:
-                    self.update_interval = new_interval
-                    _LOGGER.info(
-                        "⚡ Boost mode active for %s - interval: %d seconds",
-                        self.airport,
-                        boost_interval,
-                    )
-        else:
-            # Restore normal interval if boost ended
-            if self.update_interval != self._normal_interval:
-                self.update_interval = self._normal_interval
+        """Request an update through the orchestrator, ahead of routine ones."""
+        await self.async_request_poll(FLIGHT_TYPE_BOTH)
+
+    async def async_request_poll(self, flight_type: str) -> None:
+        """Request an update of the loops covering a flight type.
+
+        A request for both flight types updates every loop.
+        """
+        if self._orchestrator is None:
+            await super().async_request_refresh()
+            return
+        for loop_type in self._loops:
+            if FLIGHT_TYPE_BOTH in (flight_type, loop_type) or flight_type == loop_type:
+                self._orchestrator.request((self.entry.entry_id, loop_type))
+
+    def get_polling_stats(self) -> dict[str, Any]:
+        """Get the next interval and today's update budget use.
+
+        With separate loops the budgets are summed and the interval of each
+        flight type is added.
+        """
+        stats = {
+            "update_interval_seconds": int(self.refresh_interval.total_seconds()),
+            "daily_update_budget": 0,
+            "updates_today": 0,
+        }
+        for loop in self._loops.values():
+            for key, value in loop.adaptive_interval.get_stats().items():
+                stats[key] += value
+        if len(self._loops) > 1:
+            stats["update_interval_seconds_by_type"] = {
+                flight_type: int(loop.interval.total_seconds())
+                for flight_type, loop in self._loops.items()
+            }
+        return stats
+
+    def set_batch_fetcher(self, batch_fetcher: BatchFetcher) -> None:
+        """Set the shared batch fetcher used in delta sync mode."""
+        if self.fetch_mode == FETCH_MODE_DELTA:
+            self._batch_fetcher = batch_fetcher
+            batch_fetcher.register(self)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners, unless the data is unchanged since they last were.
+
+        Skipping unchanged data saves every entity from rebuilding its
+        attributes and the recorder from storing them again.
+        """
+        fingerprint = None
+        if self.last_update_success and self.data is not None:
+            fingerprint = hash(
+                (
+                    self.data.get("stale", False),
+                    fingerprint_flights(self.data["arrivals"]),
+                    fingerprint_flights(self.data["departures"]),
+                )
+            )
+            if fingerprint == self._fingerprint:
+                self.suppressed_updates += 1
+                _LOGGER.debug("Data unchanged for %s, skipping state writes", self.airport)
+                return
+
+        self._fingerprint = fingerprint
+        super().async_update_listeners()
+
+    def _plan_next_update(self, loop: _PollLoop, data: dict[str, Any]) -> None:
+        """Set the interval until the next update of a loop.
+
+        Boost mode sets a fixed short interval, otherwise it follows the
+        activity on the flight board of the loop's flight types.
+        """
+        boost_interval = None
+        if self._boost_mode:
+            boost_interval = self._boost_mode.get_boost_interval(
+                self.entry.entry_id, loop.flight_type
+            )
+
+        if boost_interval:
+            if not loop.boosting:
                 _LOGGER.info(
-                    "Normal mode restored for %s - interval: %d minutes",
+                    "⚡ Boost mode active for %s %s - interval: %d seconds",
                     self.airport,
-                    int(self._normal_interval.total_seconds() / 60),
+                    loop.flight_type,
+                    boost_interval,
                 )
+            loop.boosting = True
+            loop.interval = timedelta(seconds=boost_interval)
+            loop.priority = PRIORITY_BOOST
+            return
 
-        await super().async_request_refresh()
+        if loop.boosting:
+            _LOGGER.info("Normal mode restored for %s %s", self.airport, loop.flight_type)
+            loop.boosting = False
+
+        throttle = self._budget_controller.throttle if self._budget_controller else 1.0
+        flights = chain.from_iterable(
+            data[flight_type]
+            for flight_type in self._flight_types
+            if loop.flight_type in (flight_type, FLIGHT_TYPE_BOTH)
+        )
+        loop.interval = loop.adaptive_interval.next_interval(flights, throttle=throttle)
+        loop.priority = (
+            PRIORITY_ACTIVE if loop.adaptive_interval.active else PRIORITY_BACKGROUND
+        )
+        _LOGGER.debug(
+            "Next update for %s %s in %d seconds",
+            self.airport,
+            loop.flight_type,
+            loop.interval.total_seconds(),
+        )
 
     async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from API."""
-        try:
-            data = {
-                "airport": self.airport,
-                "arrivals": [],
-                "departures": [],
-            }
+        """Fetch data from API.
 
-            # Fetch arrivals
-            if self.flight_type in (FLIGHT_TYPE_ARRIVALS, FLIGHT_TYPE_BOTH):
-                _LOGGER.debug("Fetching arrivals for %s", self.airport)
-                arrivals = await self.api.get_flights_by_date_range(
-                    self.airport,
-                    "arrivals",
-                    hours_back=self.hours_back,
-                    hours_ahead=self.hours_ahead,
-                )
-                data["arrivals"] = arrivals
-                _LOGGER.debug("Got %d arrivals", len(arrivals))
+        An update of one loop fetches only its flight types.
+        """
+        loops = [self._polling] if self._polling else list(self._loops.values())
+        if self._polling and self._polling.flight_type != FLIGHT_TYPE_BOTH:
+            flight_types = [self._polling.flight_type]
+        else:
+            flight_types = self._flight_types
 
-            # Fetch departures
-            if self.flight_type in (FLIGHT_TYPE_DEPARTURES, FLIGHT_TYPE_BOTH):
-                _LOGGER.debug("Fetching departures for %s", self.airport)
-                departures = await self.api.get_flights_by_date_range(
+        self.api.reset_retry_budget()
+        try:
+            if self._batch_fetcher is not None:
+                await self._batch_fetcher.async_refresh(self)
+                data = self.build_delta_data()
+            elif self.fetch_mode == FETCH_MODE_WINDOW:
+                # The server returns only flights in the window, of all
+                # flight types in one call
+                flights = await self.api.get_flights_in_window(
                     self.airport,
-                    "departures",
+                    self.flight_type,
                     hours_back=self.hours_back,
                     hours_ahead=self.hours_ahead,
                 )
-                data["departures"] = departures
-                _LOGGER.debug("Got %d departures", len(departures))
+                data = self._build_data(
+                    {
+                        flight_type: map(
+                            self._indexes[flight_type].build, flights[flight_type]
+                        )
+                        for flight_type in flight_types
+                    }
+                )
+            else:
+                data = self._build_data(await self._async_update_segments(flight_types))
 
+            for loop in loops:
+                self._plan_next_update(loop, data)
             return data
 
         except SwedaviaAPIError as err:
+            # Keep serving the last good data through an outage
+            if self.data and self.api.circuit_breaker.state != STATE_CLOSED:
+                _LOGGER.warning(
+                    "Swedavia API unavailable, serving last known data for %s: %s",
+                    self.airport,
+                    err,
+                )
+                return {**self.data, "stale": True, "changes": {}}
             raise UpdateFailed(f"Error fetching data: {err}") from err
+
+    async def _async_update_segments(
+        self, flight_types: list[str]
+    ) -> dict[str, Iterable[Flight]]:
+        """Fetch the days that are due and get the flights of all days.
+
+        Today is fetched every update, later days only once their refresh
+        interval has passed, as their schedules barely change. Days are
+        kept as flight records, so the fetched payloads can be freed.
+        """
+        now = time.monotonic()
+        today = local_today()
+        dates = self.query_dates()
+
+        # Forget days that have left the window
+        for key in [key for key in self._segments if key[1] not in dates]:
+            del self._segments[key]
+
+        due = [
+            (flight_type, day)
+            for flight_type in flight_types
+            for day in dates
+            if (segment := self._segments.get((flight_type, day))) is None
+            or now - segment.fetched >= segment_max_age(day, today)
+        ]
+
+        _LOGGER.debug(
+            "Fetching %d of %d days for %s",
+            len(due),
+            len(dates) * len(flight_types),
+            self.airport,
+        )
+        results = await asyncio.gather(
+            *(
+                self.api.get_flights_for_date(self.airport, flight_type, day.isoformat())
+                for flight_type, day in due
+            )
+        )
+
+        if due and all(flights is None for flights in results):
+            raise SwedaviaAPIError(f"Failed to get flights for {self.airport}")
+
+        # A day that failed keeps its last list and is retried next update
+        for key, flights in zip(due, results):
+            if flights is not None:
+                build = self._indexes[key[0]].build
+                self._segments[key] = _DaySegment(list(map(build, flights)), now)
+
+        return {
+            flight_type: chain.from_iterable(
+                [
+                    segment.flights
+                    for (segment_type, _), segment in self._segments.items()
+                    if segment_type == flight_type
+                ]
+            )
+            for flight_type in flight_types
+        }
+
+    def query_dates(self) -> list[date]:
+        """Get the Swedish local dates covered by the time window."""
+        return dates_in_window(self.hours_back, self.hours_ahead)
+
+    def build_delta_data(self) -> dict[str, Any]:
+        """Build coordinator data from the shared delta-synced flight set."""
+        return self._build_data(
+            {
+                flight_type: map(
+                    self._indexes[flight_type].build,
+                    self._batch_fetcher.get_flights(self.airport, flight_type),
+                )
+                for flight_type in self._flight_types
+            }
+        )
+
+    def _build_data(self, flights: dict[str, Iterable[Flight]]) -> dict[str, Any]:
+        """Merge the flights in the time window into the index.
+
+        The data carries the flights added, changed and removed since the
+        previous update per flight type under "changes". Flight types not
+        in ``flights`` keep their indexed flights and have no changes.
+        """
+        data = {
+            "airport": self.airport,
+            "arrivals": [],
+            "departures": [],
+            "stale": False,
+            "changes": {},
+        }
+
+        for flight_type in self._flight_types:
+            if flight_type not in flights:
+                data[flight_type] = self._indexes[flight_type].flights
+
+        for flight_type, type_flights in flights.items():
+            index = self._indexes[flight_type]
+            changes = index.update(
+                select_flights_in_window(type_flights, self.hours_back, self.hours_ahead)
+            )
+            data[flight_type] = index.flights
+            data["changes"][flight_type] = changes
+            _LOGGER.debug(
+                "Got %d %s for %s (%d added, %d changed, %d removed)",
+                len(data[flight_type]),
+                flight_type,
+                self.airport,
+                len(changes.added),
+                len(changes.changed),
+                len(changes.removed),
+            )
+
+        return data
@@ -0,0 +1,66 @@
+"""Plan which Swedish local dates a time window covers."""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from .const import (
+    SEGMENT_REFRESH_LATER,
+    SEGMENT_REFRESH_TOMORROW,
+    SWEDAVIA_TIME_ZONE,
+)
+
+HOURS_PER_DAY = 24
+
+
+def local_today() -> date:
+    """Get today's Swedish local date."""
+    return datetime.now(ZoneInfo(SWEDAVIA_TIME_ZONE)).date()
+
+
+def dates_in_window(
+    hours_back: int,
+    hours_ahead: int,
+    now: datetime | None = None,
+) -> list[date]:
+    """Get the Swedish local dates the window around now crosses.
+
+    Flight lists are per Swedish local date, so these are exactly the
+    dates that have to be fetched to cover the window.
+    """
+    tz = ZoneInfo(SWEDAVIA_TIME_ZONE)
+    now = now or datetime.now(timezone.utc)
+    start = (now - timedelta(hours=hours_back)).astimezone(tz).date()
+    end = (now + timedelta(hours=hours_ahead)).astimezone(tz).date()
+
+    dates = []
+    while start <= end:
+        dates.append(start)
+        start += timedelta(days=1)
+    return dates
+
+
+def segment_max_age(day: date, today: date) -> int:
+    """Get how old a fetched day may get before it is fetched again."""
+    offset = (day - today).days
+    if offset <= 0:
+        return 0
+    if offset == 1:
+        return SEGMENT_REFRESH_TOMORROW
+    return SEGMENT_REFRESH_LATER
+
+
+def average_dates_by_offset(
+    hours_back: int, hours_ahead: int
+) -> tuple[float, float, float]:
+    """Get how many window dates are up to today, tomorrow and later.
+
+    Averaged over a day: the window crosses one more date for each local
+    midnight inside it, and N hours contain N / 24 midnights on average.
+    """
+    days_ahead = hours_ahead / HOURS_PER_DAY
+    return (
+        1 + hours_back / HOURS_PER_DAY,
+        min(days_ahead, 1.0),
+        max(days_ahead - 1, 0.0),
+    )
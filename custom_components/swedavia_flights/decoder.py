@@ -0,0 +1,16 @@
+"""JSON decoding of Swedavia API responses."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Fastest available backend for decoding a whole body from bytes. orjson
+# ships with Home Assistant, the stdlib is the fallback.
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+json_loads: Callable[[bytes], Any] = orjson.loads if orjson is not None else json.loads
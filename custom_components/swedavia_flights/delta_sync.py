@@ -0,0 +1,143 @@
+"""Delta synchronization against the Swedavia /query endpoint."""
+from __future__ import annotations
+
+import logging
+from typing import Any, TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import FLIGHT_TYPE_ARRIVALS, QUERY_PAGE_SIZE
+
+if TYPE_CHECKING:
+    from .api import SwedaviaFlightAPI
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY_PREFIX = "swedavia_flights_delta"
+SAVE_DELAY_SECONDS = 60
+
+
+def flight_key(item: dict[str, Any]) -> str | None:
+    """Return a stable key for a /query flight item."""
+    if arrival := item.get("arrival"):
+        direction, flight = "A", arrival
+        airport = flight.get("flightLegIdentifier", {}).get("arrivalAirportIata", "")
+    elif departure := item.get("departure"):
+        direction, flight = "D", departure
+        airport = flight.get("flightLegIdentifier", {}).get("departureAirportIata", "")
+    else:
+        return None
+
+    flight_id = flight.get("flightId")
+    if not flight_id:
+        return None
+
+    return f"{airport}|{direction}|{flight_id}|{item.get('scheduledDate', '')}"
+
+
+class DeltaSync:
+    """Keep a local flight set in sync using /query continuation tokens.
+
+    The first sync for a filter downloads every matching flight (the
+    baseline). After that only flights changed since the stored token are
+    requested and applied to the local set. Token and flight set are
+    persisted, so a restart resumes from the token instead of downloading
+    everything again.
+    """
+
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        """Initialize the delta sync."""
+        self._hass = hass
+        self._store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY_PREFIX}_{key}")
+        self._filter: str | None = None
+        self._token: str | None = None
+        self._flights: dict[str, dict[str, Any]] = {}
+        self._initialized = False
+
+    async def async_initialize(self) -> None:
+        """Load stored token and flights from disk."""
+        if self._initialized:
+            return
+
+        data = await self._store.async_load()
+        if data and data.get("token"):
+            self._filter = data.get("filter")
+            self._token = data["token"]
+            self._flights = data.get("flights", {})
+            _LOGGER.info(
+                "Restored delta sync state with %d flights", len(self._flights)
+            )
+
+        self._initialized = True
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return data to persist."""
+        return {
+            "filter": self._filter,
+            "token": self._token,
+            "flights": self._flights,
+        }
+
+    async def async_sync(self, api: SwedaviaFlightAPI, filter_expr: str) -> int:
+        """Bring the local flight set up to date.
+
+        Returns the number of flights added or changed.
+        """
+        if not self._initialized:
+            await self.async_initialize()
+
+        baseline = filter_expr != self._filter or not self._token
+        if baseline:
+            _LOGGER.debug("Delta sync baseline load with filter %s", filter_expr)
+            flights: dict[str, dict[str, Any]] = {}
+            token = None
+        else:
+            flights = self._flights
+            token = self._token
+
+        changed = 0
+        while True:
+            response = await api.query_flights(filter_expr, token)
+            items = response.get("flights") or []
+
+            for item in items:
+                if key := flight_key(item):
+                    flights[key] = item
+                    changed += 1
+
+            token = response.get("continuationtoken") or token
+
+            # A full page means there may be more flights behind the token
+            if len(items) < QUERY_PAGE_SIZE or not token:
+                break
+
+        # Only commit once every page has been applied
+        self._filter = filter_expr
+        self._token = token
+        self._flights = flights
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY_SECONDS)
+
+        _LOGGER.debug(
+            "Delta sync %s: %d flights changed, %d flights in set",
+            "baseline" if baseline else "update",
+            changed,
+            len(flights),
+        )
+
+        return changed
+
+    def get_flights(self, airport: str, flight_type: str) -> list[dict[str, Any]]:
+        """Get flights of one type for an airport from the local set."""
+        direction = "A" if flight_type == FLIGHT_TYPE_ARRIVALS else "D"
+        prefix = f"{airport}|{direction}|"
+        field = "arrival" if direction == "A" else "departure"
+
+        return [
+            item[field] for key, item in self._flights.items() if key.startswith(prefix)
+        ]
+
+    async def async_remove(self) -> None:
+        """Remove persisted state."""
+        await self._store.async_remove()
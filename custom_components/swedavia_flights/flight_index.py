@@ -0,0 +1,106 @@
+"""Incremental index of the flights shown by a coordinator."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+import time
+from typing import Any
+
+from .models import Flight, FlightKey, FlightStatus, flight_key
+
+
+def is_finalized(flight: Flight) -> bool:
+    """Return True if nothing more will happen to a flight.
+
+    Arrivals are done when landed with the last bag delivered, departures
+    when departed.
+    """
+    if flight.is_arrival:
+        return flight.status is FlightStatus.LANDED and flight.last_bag is not None
+    return flight.status is FlightStatus.DEPARTED
+
+
+def select_flights_in_window(
+    flights: Iterable[Flight], hours_back: int, hours_ahead: int
+) -> Iterator[Flight]:
+    """Filter flights to those whose most accurate time is within the window."""
+    now = int(time.time())
+    start = now - hours_back * 3600
+    end = now + hours_ahead * 3600
+    return (flight for flight in flights if start <= flight.effective_ts <= end)
+
+
+@dataclass(slots=True)
+class FlightChanges:
+    """Flights added, changed and removed by one update."""
+
+    added: set[FlightKey] = field(default_factory=set)
+    changed: set[FlightKey] = field(default_factory=set)
+    removed: set[FlightKey] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        """Return True if anything changed."""
+        return bool(self.added or self.changed or self.removed)
+
+
+class FlightIndex:
+    """Flights of one direction by identity, merged update by update.
+
+    Unchanged flights keep their record, so consumers can compare records
+    by identity, and finalized flights are frozen: build() hands out their
+    records without rebuilding them until they leave the window.
+    """
+
+    def __init__(
+        self,
+        is_arrival: bool,
+        intern: Callable[[str], str] | None = None,
+    ) -> None:
+        """Initialize the index."""
+        self._is_arrival = is_arrival
+        self._intern = intern
+        self._flights: dict[FlightKey, Flight] = {}
+        self._frozen: dict[FlightKey, Flight] = {}
+
+    @property
+    def flights(self) -> list[Flight]:
+        """Get the indexed flights."""
+        return list(self._flights.values())
+
+    def build(self, data: dict[str, Any]) -> Flight:
+        """Build the record of an API object, reusing it if frozen."""
+        if frozen := self._frozen.get(flight_key(data)):
+            return frozen
+        return Flight.from_api(data, self._is_arrival, self._intern)
+
+    def update(self, flights: Iterable[Flight]) -> FlightChanges:
+        """Merge the current flight records and return what changed.
+
+        Flights missing from ``flights`` are removed.
+        """
+        previous = self._flights
+        current: dict[FlightKey, Flight] = {}
+        changes = FlightChanges()
+
+        for flight in flights:
+            key = flight.key
+            if key in current:
+                continue
+
+            old = previous.get(key)
+            if old is None:
+                changes.added.add(key)
+            elif old is flight or old == flight:
+                flight = old
+            else:
+                changes.changed.add(key)
+
+            current[key] = flight
+            if is_finalized(flight):
+                self._frozen[key] = flight
+
+        changes.removed = previous.keys() - current.keys()
+        for key in changes.removed:
+            self._frozen.pop(key, None)
+        self._flights = current
+        return changes
@@ -0,0 +1,257 @@
+"""Flight records built from Swedavia API responses."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, fields
+from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+from operator import attrgetter
+import sys
+from typing import Any
+
+# Upper bound for the interning table, well above the distinct values seen
+# for all Swedish airports
+MAX_INTERNED_STRINGS = 10000
+
+# Timestamps repeat across flights (slots, gate times) and refreshes
+PARSE_CACHE_SIZE = 8192
+
+# Stable flight identity: flight ID and departure date (UTC) of the leg
+FlightKey = tuple[str, str]
+
+
+class FlightStatus(str, Enum):
+    """Flight leg status code."""
+
+    SCHEDULED = "SCH"
+    FLIGHT_PLAN = "FPL"
+    FINAL_APPROACH = "FLS"
+    SEQUENCED = "SEQ"
+    AIRBORNE = "ACT"
+    CANCELLED = "CAN"
+    LANDED = "LAN"
+    REROUTED = "RER"
+    DIVERTED = "DIV"
+    DELAYED = "DEL"
+    DEPARTED = "DEP"
+    UNKNOWN = ""
+
+    @classmethod
+    def _missing_(cls, value: object) -> FlightStatus:
+        """Map codes not listed in the API documentation to UNKNOWN."""
+        return cls.UNKNOWN
+
+
+class StringInterner:
+    """Share equal strings between flight records.
+
+    Airline names, statuses, terminals and airport names repeat across
+    flights, airports and refreshes. Records built through the interner
+    point at one copy of each instead of the copy in their own payload.
+    This only saves memory once a payload is no longer held elsewhere,
+    such as by the response cache, so only the lookups are counted.
+    """
+
+    def __init__(self, max_entries: int = MAX_INTERNED_STRINGS) -> None:
+        """Initialize the interner."""
+        self._strings: dict[str, str] = {}
+        self._max_entries = max_entries
+        self.deduplicated = 0
+
+    def __call__(self, value: str) -> str:
+        """Return the shared copy of a string."""
+        if not value:
+            return value
+        canonical = self._strings.get(value)
+        if canonical is None:
+            if len(self._strings) < self._max_entries:
+                self._strings[value] = value
+            return value
+        if canonical is not value:
+            self.deduplicated += 1
+        return canonical
+
+    def clear(self) -> None:
+        """Forget all shared strings."""
+        self._strings.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get table size and the number of copies replaced."""
+        return {
+            "interned_strings": len(self._strings),
+            "interned_bytes": sum(sys.getsizeof(value) for value in self._strings),
+            "deduplicated_strings": self.deduplicated,
+        }
+
+
+def flight_key(data: dict[str, Any]) -> FlightKey:
+    """Get the identity of an arrival or departure API object."""
+    leg = data.get("flightLegIdentifier") or {}
+    return (
+        leg.get("flightId") or data.get("flightId", ""),
+        leg.get("flightDepartureDateUtc", ""),
+    )
+
+
+def _no_intern(value: str) -> str:
+    """Return a string as is."""
+    return value
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_utc(value: str | None) -> datetime | None:
+    """Parse an API UTC timestamp, returning None if missing or invalid."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, AttributeError):
+        return None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_utc_timestamp(value: str | None) -> int | None:
+    """Parse an API UTC timestamp to epoch seconds."""
+    if parsed := parse_utc(value):
+        return int(parsed.timestamp())
+    return None
+
+
+def effective_time(times: dict[str, Any]) -> str | None:
+    """Return the most accurate time string of an API time object."""
+    return times.get("actualUtc") or times.get("estimatedUtc") or times.get("scheduledUtc")
+
+
+def format_utc(value: datetime | None) -> str:
+    """Format a timestamp the way the API does, or "" if missing."""
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ") if value else ""
+
+
+@dataclass(slots=True)
+class Flight:
+    """A flight with only the fields the integration uses.
+
+    Built once when data is fetched, with timestamps parsed and Swedish
+    texts only, so sensors do not walk the nested API dicts.
+    """
+
+    flight_id: str
+    is_arrival: bool
+    airline: str
+    airline_iata: str
+    airline_icao: str
+    # Origin for arrivals, destination for departures (Swedish name)
+    other_airport: str
+    scheduled: datetime | None
+    estimated: datetime | None
+    actual: datetime | None
+    status: FlightStatus
+    status_text: str
+    terminal: str
+    gate: str
+    code_share: tuple[str, ...]
+    remarks: str
+    # Epoch seconds of the most accurate time and of the scheduled time, for
+    # filtering and sorting (0 if missing)
+    effective_ts: int
+    scheduled_ts: int
+    # Flight ID and departure date of the leg, for matching across updates
+    key: FlightKey
+    # Departures only
+    gate_action: str = ""
+    gate_open: datetime | None = None
+    gate_close: datetime | None = None
+    check_in_status: str = ""
+    check_in_from: int | None = None
+    check_in_to: int | None = None
+    # Arrivals only
+    baggage_claim: str = ""
+    estimated_first_bag: datetime | None = None
+    first_bag: datetime | None = None
+    last_bag: datetime | None = None
+
+    @property
+    def best_time(self) -> datetime | None:
+        """Return the most accurate known time."""
+        return self.actual or self.estimated or self.scheduled
+
+    @classmethod
+    def from_api(
+        cls,
+        data: dict[str, Any],
+        is_arrival: bool,
+        intern: Callable[[str], str] | None = None,
+    ) -> Flight:
+        """Build a flight from an arrival or departure API object.
+
+        Repeating texts are passed through ``intern`` when given.
+        """
+        intern = intern or _no_intern
+        airline = data.get("airlineOperator") or {}
+        times = data.get("arrivalTime" if is_arrival else "departureTime") or {}
+        location = data.get("locationAndStatus") or {}
+        remarks = ", ".join(
+            text
+            for remark in data.get("remarksSwedish") or []
+            if (text := remark.get("text"))
+        )
+
+        flight = cls(
+            flight_id=intern(data.get("flightId", "")),
+            is_arrival=is_arrival,
+            airline=intern(airline.get("name", "")),
+            airline_iata=intern(airline.get("iata", "")),
+            airline_icao=intern(airline.get("icao", "")),
+            other_airport=intern(
+                data.get(
+                    "departureAirportSwedish" if is_arrival else "arrivalAirportSwedish",
+                    "",
+                )
+            ),
+            scheduled=parse_utc(times.get("scheduledUtc")),
+            estimated=parse_utc(times.get("estimatedUtc")),
+            actual=parse_utc(times.get("actualUtc")),
+            status=FlightStatus(location.get("flightLegStatus") or ""),
+            status_text=intern(location.get("flightLegStatusSwedish", "")),
+            terminal=intern(location.get("terminal", "")),
+            gate=intern(location.get("gate", "")),
+            code_share=tuple(intern(code) for code in data.get("codeShareData") or ()),
+            remarks=intern(remarks),
+            effective_ts=parse_utc_timestamp(effective_time(times)) or 0,
+            scheduled_ts=parse_utc_timestamp(times.get("scheduledUtc")) or 0,
+            key=flight_key(data),
+        )
+
+        if is_arrival:
+            baggage = data.get("baggage") or {}
+            flight.baggage_claim = intern(baggage.get("baggageClaimUnit") or "")
+            flight.estimated_first_bag = parse_utc(baggage.get("estimatedFirstBagUtc"))
+            flight.first_bag = parse_utc(baggage.get("firstBagUtc"))
+            flight.last_bag = parse_utc(baggage.get("lastBagUtc"))
+        else:
+            check_in = data.get("checkIn") or {}
+            flight.gate_action = intern(location.get("gateActionSwedish", ""))
+            flight.gate_open = parse_utc(location.get("gateOpenUtc"))
+            flight.gate_close = parse_utc(location.get("gateCloseUtc"))
+            flight.check_in_status = intern(check_in.get("checkInStatusSwedish", ""))
+            flight.check_in_from = check_in.get("checkInDeskFrom")
+            flight.check_in_to = check_in.get("checkInDeskTo")
+
+        return flight
+
+
+# Fields shown by sensors; is_arrival, the epoch timestamps and the key
+# are derived
+_FINGERPRINT_FIELDS = attrgetter(
+    *(
+        field.name
+        for field in fields(Flight)
+        if field.name not in ("is_arrival", "effective_ts", "scheduled_ts", "key")
+    )
+)
+
+
+def fingerprint_flights(flights: Iterable[Flight]) -> int:
+    """Hash the contents and order of flight records."""
+    return hash(tuple(map(_FINGERPRINT_FIELDS, flights)))
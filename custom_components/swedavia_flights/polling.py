@@ -0,0 +1,186 @@
+"""Central scheduling of the updates of all config entries."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+import heapq
+from itertools import count
+import logging
+import time
+from typing import Any, TypeVar
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# Urgency of a job, lowest first
+PRIORITY_BOOST = 0
+PRIORITY_ACTIVE = 1
+PRIORITY_BACKGROUND = 2
+
+# Seconds between the end of one job and the start of the next
+DISPATCH_SPACING = 2.0
+
+# Seconds until a job that raised runs again
+RETRY_DELAY = 300
+
+# A job performs an update and returns (seconds until next run, priority)
+PollJob = Callable[[], Awaitable[tuple[float, int]]]
+
+
+class PollingOrchestrator:
+    """Run the updates of every airport and direction through one worker.
+
+    Jobs wait in a queue ordered by when they are due. Jobs run one at a
+    time with a short pause in between, so updates never burst however
+    many entries exist. When several jobs are due, the most urgent one
+    runs first: boosted jobs, then those with activity on their flight
+    board, then the rest.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the orchestrator."""
+        self._hass = hass
+        # (due, priority, sequence, key); superseded entries stay until popped
+        self._queue: list[tuple[float, int, int, Hashable]] = []
+        self._jobs: dict[Hashable, PollJob] = {}
+        # Sequence number of the queue entry that is current for each key
+        self._scheduled: dict[Hashable, int] = {}
+        self._sequence = count()
+        self._lock = asyncio.Lock()
+        self._last_run = 0.0
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self.runs = 0
+        self.max_lateness = 0.0
+
+    @callback
+    def register(self, key: Hashable, job: PollJob, delay: float) -> None:
+        """Register a job, first run in ``delay`` seconds."""
+        self._jobs[key] = job
+        self.schedule(key, delay, PRIORITY_BACKGROUND)
+
+    @callback
+    def unregister(self, key: Hashable) -> None:
+        """Stop running a job."""
+        self._jobs.pop(key, None)
+        self._scheduled.pop(key, None)
+        if not self._jobs and self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def schedule(self, key: Hashable, delay: float, priority: int) -> None:
+        """Set when a job runs next, replacing its earlier schedule."""
+        if key not in self._jobs:
+            return
+        sequence = next(self._sequence)
+        self._scheduled[key] = sequence
+        heapq.heappush(self._queue, (time.monotonic() + delay, priority, sequence, key))
+        if not self._lock.locked():
+            self._arm()
+
+    @callback
+    def request(self, key: Hashable) -> None:
+        """Run a job as soon as the worker is free."""
+        self.schedule(key, 0, PRIORITY_BOOST)
+
+    async def async_run_exclusive(self, run: Callable[[], Awaitable[_T]]) -> _T:
+        """Run an update outside the queue, but never alongside a job."""
+        try:
+            async with self._lock:
+                await self._async_wait_spacing()
+                try:
+                    return await run()
+                finally:
+                    self._last_run = time.monotonic()
+        finally:
+            self._arm()
+
+    async def _async_wait_spacing(self) -> None:
+        """Wait until the pause after the previous run has passed."""
+        wait = self._last_run + DISPATCH_SPACING - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _pop_stale(self) -> None:
+        """Drop superseded entries from the head of the queue."""
+        while self._queue:
+            _, _, sequence, key = self._queue[0]
+            if self._scheduled.get(key) == sequence:
+                return
+            heapq.heappop(self._queue)
+
+    @callback
+    def _arm(self) -> None:
+        """Set the timer for the next due job."""
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._pop_stale()
+        if not self._queue:
+            return
+        due = max(self._queue[0][0], self._last_run + DISPATCH_SPACING)
+        self._unsub_timer = async_call_later(
+            self._hass, max(due - time.monotonic(), 0), self._async_dispatch
+        )
+
+    async def _async_dispatch(self, _now: Any = None) -> None:
+        """Run the most urgent due job and schedule its next run."""
+        self._unsub_timer = None
+        async with self._lock:
+            await self._async_wait_spacing()
+            now = time.monotonic()
+
+            due = []
+            while self._queue and self._queue[0][0] <= now:
+                item = heapq.heappop(self._queue)
+                if self._scheduled.get(item[3]) == item[2]:
+                    due.append(item)
+            if not due:
+                self._arm()
+                return
+
+            item = min(due, key=lambda item: (item[1], item[0]))
+            for other in due:
+                if other is not item:
+                    heapq.heappush(self._queue, other)
+            due_at, priority, sequence, key = item
+            del self._scheduled[key]
+            self.max_lateness = max(self.max_lateness, now - due_at)
+
+            _LOGGER.debug(
+                "Running update %s (priority %d, %.1f seconds late)",
+                key,
+                priority,
+                now - due_at,
+            )
+            try:
+                delay, priority = await self._jobs[key]()
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Update %s failed", key)
+                delay, priority = RETRY_DELAY, PRIORITY_BACKGROUND
+            finally:
+                self._last_run = time.monotonic()
+                self.runs += 1
+
+            # Keep a schedule set by a request during the run
+            if key in self._jobs and key not in self._scheduled:
+                self.schedule(key, delay, priority)
+
+        self._arm()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get the queue state."""
+        self._pop_stale()
+        now = time.monotonic()
+        return {
+            "scheduled_jobs": len(self._scheduled),
+            "next_job_in_seconds": (
+                max(int(self._queue[0][0] - now), 0) if self._queue else None
+            ),
+            "job_runs": self.runs,
+            "max_job_lateness_seconds": round(self.max_lateness, 1),
+        }
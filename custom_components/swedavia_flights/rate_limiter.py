@@ -0,0 +1,114 @@
+"""Shared rate limiter for Swedavia API requests."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import Any
+
+from .const import QUERY_MIN_INTERVAL
+
+_LOGGER = logging.getLogger(__name__)
+
+BUCKET_QUERY = "query"
+BUCKET_FLIGHTS = "flights"
+
+# Bucket settings: (tokens per second, burst capacity)
+BUCKET_SETTINGS: dict[str, tuple[float, float]] = {
+    BUCKET_QUERY: (1 / QUERY_MIN_INTERVAL, 1),  # Hard API limit, 429 above it
+    BUCKET_FLIGHTS: (1.0, 4),  # One call per second, bursts of 4 for parallel dates
+}
+
+
+def bucket_for_endpoint(endpoint: str) -> str:
+    """Map an API endpoint to its rate limit bucket."""
+    if endpoint == "query":
+        return BUCKET_QUERY
+    return BUCKET_FLIGHTS
+
+
+@dataclass
+class TokenBucket:
+    """Token bucket refilled on the monotonic clock."""
+
+    rate: float
+    capacity: float
+    tokens: float = field(init=False)
+    updated: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Start with a full bucket."""
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        """Add tokens for the time passed since the last refill."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until_token(self) -> float:
+        """Seconds until one token is available."""
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self) -> None:
+        """Take one token."""
+        self._refill()
+        self.tokens -= 1
+
+
+class RateLimiter:
+    """Rate limiter shared by every API client in the process.
+
+    Each endpoint type has its own token bucket. Waiting requests are
+    served first come, first served: the per-bucket lock is held while
+    waiting for a token, and asyncio locks wake waiters in FIFO order.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the rate limiter."""
+        self._buckets: dict[str, TokenBucket] = {
+            name: TokenBucket(rate, capacity)
+            for name, (rate, capacity) in BUCKET_SETTINGS.items()
+        }
+        self._locks: dict[str, asyncio.Lock] = {
+            name: asyncio.Lock() for name in BUCKET_SETTINGS
+        }
+        self._waiting: dict[str, int] = {name: 0 for name in BUCKET_SETTINGS}
+        self._total_wait: dict[str, float] = {name: 0.0 for name in BUCKET_SETTINGS}
+
+    async def async_acquire(self, endpoint: str) -> None:
+        """Wait for permission to call an endpoint."""
+        name = bucket_for_endpoint(endpoint)
+        bucket = self._buckets[name]
+
+        self._waiting[name] += 1
+        try:
+            async with self._locks[name]:
+                wait = bucket.time_until_token()
+                if wait > 0:
+                    _LOGGER.debug(
+                        "Rate limiting %s request for %.2f seconds (%d waiting)",
+                        name,
+                        wait,
+                        self._waiting[name] - 1,
+                    )
+                    self._total_wait[name] += wait
+                    await asyncio.sleep(wait)
+                bucket.consume()
+        finally:
+            self._waiting[name] -= 1
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get waiting requests and accumulated wait time per bucket."""
+        return {
+            name: {
+                "waiting": self._waiting[name],
+                "total_wait_seconds": round(self._total_wait[name], 1),
+            }
+            for name in BUCKET_SETTINGS
+        }
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from datetime import datetime
 import logging
+from operator import attrgetter
 from typing import Any
 
 from homeassistant.components.sensor import SensorEntity, SensorStateClass
@@ -11,6 +12,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .circuit_breaker import STATE_CLOSED
 from .const import (
     ATTR_ACTUAL_TIME,
     ATTR_AIRLINE,
@@ -43,6 +45,7 @@ from .const import (
     FLIGHT_TYPE_BOTH,
     FLIGHT_TYPE_DEPARTURES,
     SENSOR_TYPE_API_COUNTER,
+    SENSOR_TYPE_API_STATUS,
     SENSOR_TYPE_ARRIVALS,
     SENSOR_TYPE_BAGGAGE,
     SENSOR_TYPE_DEPARTURES,
@@ -50,6 +53,8 @@ from .const import (
     SWEDISH_AIRPORTS,
 )
 from .coordinator import SwedaviaFlightCoordinator
+from .decoder import JSON_BACKEND
+from .models import Flight, format_utc
 from .key_rotation import get_all_rotation_info
 from .update_scheduler import UpdateScheduler
 
@@ -112,6 +117,14 @@ async def async_setup_entry(
         )
     )
 
+    # Add API status sensor (one per integration instance)
+    entities.append(
+        SwedaviaAPIStatusSensor(
+            hass,
+            entry,
+        )
+    )
+
     async_add_entities(entities)
 
 
@@ -170,94 +183,65 @@ class SwedaviaFlightSensor(CoordinatorEntity[SwedaviaFlightCoordinator], SensorE
         )
         flights = self.coordinator.data.get(flights_key, [])
 
-        # Process flights
-        processed_flights = []
-        for flight in flights[:50]:  # Limit to 50 flights
-            processed_flight = self._process_flight(flight)
-            processed_flights.append(processed_flight)
-
-        # Sort by scheduled time
-        processed_flights.sort(
-            key=lambda x: x.get(ATTR_SCHEDULED_TIME, ""), reverse=False
-        )
+        # Process flights, limited to 50 and sorted by scheduled time
+        processed_flights = [
+            self._process_flight(flight)
+            for flight in sorted(flights[:50], key=attrgetter("scheduled_ts"))
+        ]
 
         return {
             "airport": self._airport,
             "airport_name": self._airport_name,
             "flights": processed_flights,
+            "stale": self.coordinator.data.get("stale", False),
             "last_updated": datetime.now().isoformat(),
         }
 
-    def _process_flight(self, flight: dict[str, Any]) -> dict[str, Any]:
+    def _process_flight(self, flight: Flight) -> dict[str, Any]:
         """Process a single flight into attributes."""
-        is_arrival = self._sensor_type == SENSOR_TYPE_ARRIVALS
-
-        # Get time data
-        time_key = "arrivalTime" if is_arrival else "departureTime"
-        time_data = flight.get(time_key, {})
-
-        # Get airline data
-        airline = flight.get("airlineOperator", {})
-
-        # Get location data
-        location = flight.get("locationAndStatus", {})
-
-        # Get baggage data (arrivals only)
-        baggage = flight.get("baggage", {}) if is_arrival else {}
-
-        # Get check-in data (departures only)
-        checkin = flight.get("checkIn", {}) if not is_arrival else {}
-
-        # Get airport names
-        if is_arrival:
-            origin = flight.get("departureAirportSwedish", "")
+        if flight.is_arrival:
+            origin = flight.other_airport
             destination = self._airport_name
         else:
             origin = self._airport_name
-            destination = flight.get("arrivalAirportSwedish", "")
+            destination = flight.other_airport
 
         # Build processed flight
         processed = {
-            ATTR_FLIGHT_ID: flight.get("flightId", ""),
-            ATTR_AIRLINE: airline.get("name", ""),
-            ATTR_AIRLINE_IATA: airline.get("iata", ""),
-            ATTR_AIRLINE_ICAO: airline.get("icao", ""),
-            ATTR_SCHEDULED_TIME: time_data.get("scheduledUtc", ""),
-            ATTR_ESTIMATED_TIME: time_data.get("estimatedUtc", ""),
-            ATTR_ACTUAL_TIME: time_data.get("actualUtc", ""),
-            ATTR_STATUS: location.get("flightLegStatusSwedish", ""),
-            ATTR_TERMINAL: location.get("terminal", ""),
-            ATTR_GATE: location.get("gate", ""),
+            ATTR_FLIGHT_ID: flight.flight_id,
+            ATTR_AIRLINE: flight.airline,
+            ATTR_AIRLINE_IATA: flight.airline_iata,
+            ATTR_AIRLINE_ICAO: flight.airline_icao,
+            ATTR_SCHEDULED_TIME: format_utc(flight.scheduled),
+            ATTR_ESTIMATED_TIME: format_utc(flight.estimated),
+            ATTR_ACTUAL_TIME: format_utc(flight.actual),
+            ATTR_STATUS: flight.status_text,
+            ATTR_TERMINAL: flight.terminal,
+            ATTR_GATE: flight.gate,
             ATTR_ORIGIN: origin,
             ATTR_DESTINATION: destination,
-            ATTR_CODE_SHARE: flight.get("codeShareData", []),
+            ATTR_CODE_SHARE: list(flight.code_share),
         }
 
         # Add gate actions for departures
-        if not is_arrival:
-            processed[ATTR_GATE_ACTION] = location.get("gateActionSwedish", "")
-            processed[ATTR_GATE_OPEN] = location.get("gateOpenUtc", "")
-            processed[ATTR_GATE_CLOSE] = location.get("gateCloseUtc", "")
-            processed[ATTR_CHECK_IN_STATUS] = checkin.get("checkInStatusSwedish", "")
-            processed[ATTR_CHECK_IN_FROM] = checkin.get("checkInDeskFrom")
-            processed[ATTR_CHECK_IN_TO] = checkin.get("checkInDeskTo")
+        if not flight.is_arrival:
+            processed[ATTR_GATE_ACTION] = flight.gate_action
+            processed[ATTR_GATE_OPEN] = format_utc(flight.gate_open)
+            processed[ATTR_GATE_CLOSE] = format_utc(flight.gate_close)
+            processed[ATTR_CHECK_IN_STATUS] = flight.check_in_status
+            processed[ATTR_CHECK_IN_FROM] = flight.check_in_from
+            processed[ATTR_CHECK_IN_TO] = flight.check_in_to
 
         # Add baggage info for arrivals
-        if is_arrival:
-            processed[ATTR_BAGGAGE_CLAIM] = baggage.get("baggageClaimUnit", "")
-            processed[ATTR_ESTIMATED_FIRST_BAG] = baggage.get(
-                "estimatedFirstBagUtc", ""
-            )
-            processed[ATTR_FIRST_BAG] = baggage.get("firstBagUtc", "")
-            processed[ATTR_LAST_BAG] = baggage.get("lastBagUtc", "")
+        if flight.is_arrival:
+            processed[ATTR_BAGGAGE_CLAIM] = flight.baggage_claim
+            processed[ATTR_ESTIMATED_FIRST_BAG] = format_utc(flight.estimated_first_bag)
+            processed[ATTR_FIRST_BAG] = format_utc(flight.first_bag)
+            processed[ATTR_LAST_BAG] = format_utc(flight.last_bag)
 
         # Add remarks
-        remarks = []
-        for remark in flight.get("remarksSwedish", []):
-            if text := remark.get("text"):
-                remarks.append(text)
-        if remarks:
-            processed[ATTR_REMARKS] = ", ".join(remarks)
+        if flight.remarks:
+            processed[ATTR_REMARKS] = flight.remarks
 
         return processed
 
@@ -290,11 +274,7 @@ class SwedaviaBaggageSensor(CoordinatorEntity[SwedaviaFlightCoordinator], Sensor
 
         arrivals = self.coordinator.data.get("arrivals", [])
         # Count flights that have baggage claim information
-        count = sum(
-            1 for flight in arrivals 
-            if flight.get("baggage", {}).get("baggageClaimUnit")
-        )
-        return count
+        return sum(1 for flight in arrivals if flight.baggage_claim)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -305,53 +285,32 @@ class SwedaviaBaggageSensor(CoordinatorEntity[SwedaviaFlightCoordinator], Sensor
         arrivals = self.coordinator.data.get("arrivals", [])
         baggage_events = []
 
-        for flight in arrivals:
-            baggage = flight.get("baggage", {})
-            baggage_claim = baggage.get("baggageClaimUnit")
-            
+        # Sorted by actual/estimated/scheduled time
+        for flight in sorted(arrivals, key=attrgetter("effective_ts")):
             # Only include flights with baggage claim information
-            if not baggage_claim:
+            if not flight.baggage_claim:
                 continue
 
-            airline = flight.get("airlineOperator", {})
-            time_data = flight.get("arrivalTime", {})
-            location = flight.get("locationAndStatus", {})
-
-            # Get the most accurate arrival time
-            arrival_time = (
-                time_data.get("actualUtc")
-                or time_data.get("estimatedUtc")
-                or time_data.get("scheduledUtc", "")
-            )
-
             event = {
-                ATTR_FLIGHT_ID: flight.get("flightId", ""),
-                ATTR_AIRLINE: airline.get("name", ""),
-                ATTR_ORIGIN: flight.get("departureAirportSwedish", ""),
-                ATTR_SCHEDULED_TIME: time_data.get("scheduledUtc", ""),
-                ATTR_ACTUAL_TIME: time_data.get("actualUtc", ""),
-                ATTR_STATUS: location.get("flightLegStatusSwedish", ""),
-                ATTR_TERMINAL: location.get("terminal", ""),
-                ATTR_BAGGAGE_CLAIM: baggage_claim,
-                ATTR_ESTIMATED_FIRST_BAG: baggage.get("estimatedFirstBagUtc", ""),
-                ATTR_FIRST_BAG: baggage.get("firstBagUtc", ""),
-                ATTR_LAST_BAG: baggage.get("lastBagUtc", ""),
+                ATTR_FLIGHT_ID: flight.flight_id,
+                ATTR_AIRLINE: flight.airline,
+                ATTR_ORIGIN: flight.other_airport,
+                ATTR_SCHEDULED_TIME: format_utc(flight.scheduled),
+                ATTR_ACTUAL_TIME: format_utc(flight.actual),
+                ATTR_STATUS: flight.status_text,
+                ATTR_TERMINAL: flight.terminal,
+                ATTR_BAGGAGE_CLAIM: flight.baggage_claim,
+                ATTR_ESTIMATED_FIRST_BAG: format_utc(flight.estimated_first_bag),
+                ATTR_FIRST_BAG: format_utc(flight.first_bag),
+                ATTR_LAST_BAG: format_utc(flight.last_bag),
             }
 
             # Add code share flights
-            code_share = flight.get("codeShareData", [])
-            if code_share:
-                event[ATTR_CODE_SHARE] = code_share
+            if flight.code_share:
+                event[ATTR_CODE_SHARE] = list(flight.code_share)
 
             baggage_events.append(event)
 
-        # Sort by actual/estimated/scheduled time
-        baggage_events.sort(
-            key=lambda x: x.get(ATTR_ACTUAL_TIME) 
-            or x.get(ATTR_SCHEDULED_TIME) 
-            or ""
-        )
-
         return {
             "airport": self._airport_name,
             "airport_iata": self._airport,
@@ -501,7 +460,7 @@ class SwedaviaAPICounterSensor(SensorEntity):
         scheduler = UpdateScheduler(self._hass)
         schedule_info = scheduler.get_schedule_info()
         
-        return {
+        attributes = {
             "total_calls_30_days": stats["total_calls_30_days"],
             "remaining_calls": stats["remaining_calls"],
             "percentage_used": stats["percentage_used"],
@@ -519,6 +478,16 @@ class SwedaviaAPICounterSensor(SensorEntity):
             "estimated_usage_percentage": schedule_info["percentage_of_limit"],
         }
 
+        # Usage projection and interval throttling
+        if budget_controller := self._hass.data[DOMAIN].get("budget_controller"):
+            attributes.update(budget_controller.get_stats())
+
+        # Response cache statistics
+        if response_cache := self._hass.data[DOMAIN].get("response_cache"):
+            attributes.update(response_cache.get_stats())
+
+        return attributes
+
     @property
     def icon(self) -> str:
         """Return icon based on usage level."""
@@ -536,3 +505,70 @@ class SwedaviaAPICounterSensor(SensorEntity):
             return "mdi:alert-outline"
         else:
             return "mdi:counter"
+
+
+class SwedaviaAPIStatusSensor(SensorEntity):
+    """Sensor for the Swedavia API circuit breaker state."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the API status sensor."""
+        self._hass = hass
+        self._entry_id = entry.entry_id
+        self._attr_unique_id = f"{entry.entry_id}_{SENSOR_TYPE_API_STATUS}"
+        self._attr_name = "API Status"
+        self._attr_device_class = None
+
+    @property
+    def native_value(self) -> str | None:
+        """Return the circuit breaker state."""
+        circuit_breaker = self._hass.data.get(DOMAIN, {}).get("circuit_breaker")
+        if circuit_breaker:
+            return circuit_breaker.state
+        return None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return additional attributes."""
+        shared = self._hass.data.get(DOMAIN, {})
+        attributes: dict[str, Any] = {}
+
+        if circuit_breaker := shared.get("circuit_breaker"):
+            attributes.update(circuit_breaker.get_stats())
+            del attributes["state"]
+
+        if rate_limiter := shared.get("rate_limiter"):
+            attributes["rate_limiter"] = rate_limiter.get_stats()
+
+        if single_flight := shared.get("single_flight"):
+            attributes["coalesced_requests"] = single_flight.coalesced
+
+        if pool_stats := shared.get("pool_stats"):
+            attributes.update(pool_stats.get_stats())
+
+        if string_interner := shared.get("string_interner"):
+            attributes.update(string_interner.get_stats())
+
+        attributes["json_backend"] = JSON_BACKEND
+
+        if orchestrator := shared.get("orchestrator"):
+            attributes["polling"] = orchestrator.get_stats()
+
+        coordinator = shared.get(self._entry_id)
+        if isinstance(coordinator, SwedaviaFlightCoordinator):
+            attributes["suppressed_updates"] = coordinator.suppressed_updates
+            attributes.update(coordinator.get_polling_stats())
+
+        return attributes
+
+    @property
+    def icon(self) -> str:
+        """Return icon based on the breaker state."""
+        if self.native_value in (None, STATE_CLOSED):
+            return "mdi:api"
+        return "mdi:api-off"
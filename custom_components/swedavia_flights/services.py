@@ -10,7 +10,15 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.helpers import config_validation as cv
 
-from .const import CONF_API_KEY, CONF_API_KEY_SECONDARY, CONF_AIRPORT, DOMAIN
+from .const import (
+    CONF_API_KEY,
+    CONF_API_KEY_SECONDARY,
+    CONF_AIRPORT,
+    DOMAIN,
+    FLIGHT_TYPE_ARRIVALS,
+    FLIGHT_TYPE_BOTH,
+    FLIGHT_TYPE_DEPARTURES,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,6 +37,9 @@ SERVICE_ENABLE_BOOST_SCHEMA = vol.Schema(
     {
         vol.Required("airport"): cv.string,
         vol.Optional("duration", default=4): vol.All(vol.Coerce(int), vol.Range(min=1, max=12)),
+        vol.Optional("direction", default=FLIGHT_TYPE_BOTH): vol.In(
+            [FLIGHT_TYPE_ARRIVALS, FLIGHT_TYPE_DEPARTURES, FLIGHT_TYPE_BOTH]
+        ),
     }
 )
 
@@ -78,6 +89,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         """Handle the enable_boost_mode service call."""
         airport = call.data["airport"].upper()
         duration = call.data.get("duration", 4)
+        direction = call.data.get("direction", FLIGHT_TYPE_BOTH)
 
         # Find the config entry for this airport
         entry = None
@@ -97,16 +109,17 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             return
 
         # Activate boost
-        result = await boost_mode.activate_boost(entry.entry_id, duration)
+        result = await boost_mode.activate_boost(entry.entry_id, duration, direction)
         
-        # Get coordinator and trigger immediate refresh
+        # Get coordinator and trigger immediate refresh of the boosted loops
         coordinator = hass.data[DOMAIN].get(entry.entry_id)
         if coordinator:
-            await coordinator.async_request_refresh()
+            await coordinator.async_request_poll(direction)
 
         _LOGGER.info(
-            "⚡ Boost mode enabled for %s - Duration: %d hours, Estimated API calls: %d",
+            "⚡ Boost mode enabled for %s (%s) - Duration: %d hours, Estimated API calls: %d",
             airport,
+            direction,
             duration,
             result.get("estimated_calls", 0),
         )
@@ -133,13 +146,17 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             return
 
         # Deactivate boost
+        boost_info = boost_mode.get_boost_info(entry.entry_id)
         was_active = await boost_mode.deactivate_boost(entry.entry_id)
         
         if was_active:
-            # Get coordinator and trigger immediate refresh to restore normal interval
+            # Get coordinator and trigger immediate refresh of the boosted
+            # loops to restore their normal interval
             coordinator = hass.data[DOMAIN].get(entry.entry_id)
             if coordinator:
-                await coordinator.async_request_refresh()
+                await coordinator.async_request_poll(
+                    boost_info["direction"] if boost_info else FLIGHT_TYPE_BOTH
+                )
             
             _LOGGER.info("Boost mode disabled for %s", airport)
         else:
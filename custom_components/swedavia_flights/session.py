@@ -0,0 +1,161 @@
+"""Dedicated HTTP connection pool for the Swedavia API."""
+from __future__ import annotations
+
+import logging
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+from aiohttp.compression_utils import HAS_BROTLI
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util.ssl import client_context
+
+from .const import DOMAIN
+from .rate_limiter import BUCKET_FLIGHTS, BUCKET_SETTINGS
+
+_LOGGER = logging.getLogger(__name__)
+
+# No more connections than the rate limiter lets requests burst
+POOL_LIMIT_PER_HOST = int(BUCKET_SETTINGS[BUCKET_FLIGHTS][1])
+# Keep idle connections across update cycles to skip TLS handshakes
+KEEPALIVE_TIMEOUT = 300
+DNS_CACHE_TTL = 600
+
+ACCEPT_ENCODING = "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate"
+
+
+class PoolStats:
+    """Connection pool statistics collected through aiohttp tracing."""
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.dns_cache_hits = 0
+        self.dns_cache_misses = 0
+        self.compressed_responses = 0
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Create a trace config feeding these statistics."""
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(self._on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(self._on_dns_cache_miss)
+        trace_config.on_request_end.append(self._on_request_end)
+        return trace_config
+
+    async def _on_connection_create_end(
+        self, session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        """Count a new connection."""
+        self.new_connections += 1
+
+    async def _on_connection_reuseconn(
+        self, session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        """Count a reused connection."""
+        self.reused_connections += 1
+
+    async def _on_dns_cache_hit(
+        self, session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        """Count a DNS cache hit."""
+        self.dns_cache_hits += 1
+
+    async def _on_dns_cache_miss(
+        self, session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        """Count a DNS cache miss."""
+        self.dns_cache_misses += 1
+
+    async def _on_request_end(
+        self,
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceRequestEndParams,
+    ) -> None:
+        """Count body bytes once the response has been read."""
+        response = params.response
+        compressed = "Content-Encoding" in response.headers
+        if compressed:
+            self.compressed_responses += 1
+        content_length = response.headers.get("Content-Length")
+        content = response.content
+
+        def _on_eof() -> None:
+            # The stream holds decoded bytes; Content-Length is the wire size
+            decoded = content.total_bytes
+            wire = decoded
+            if content_length and content_length.isdigit():
+                wire = int(content_length)
+            self.decoded_bytes += decoded
+            self.wire_bytes += wire
+
+        content.on_eof(_on_eof)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get connection reuse and compression statistics."""
+        connections = self.new_connections + self.reused_connections
+        return {
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "connection_reuse_rate": (
+                round(self.reused_connections / connections * 100, 1)
+                if connections
+                else 0.0
+            ),
+            "dns_cache_hits": self.dns_cache_hits,
+            "dns_cache_misses": self.dns_cache_misses,
+            "compressed_responses": self.compressed_responses,
+            "wire_bytes": self.wire_bytes,
+            "decoded_bytes": self.decoded_bytes,
+        }
+
+
+@callback
+def async_get_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Get the integration's own client session, creating it on first use.
+
+    The session has its own connector, so Swedavia requests do not compete
+    with other integrations for connections in Home Assistant's shared pool.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if "session" not in domain_data:
+        pool_stats = PoolStats()
+        connector = aiohttp.TCPConnector(
+            limit_per_host=POOL_LIMIT_PER_HOST,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            ssl=client_context(),
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            trace_configs=[pool_stats.trace_config()],
+        )
+
+        async def _async_close(_event: Event) -> None:
+            """Close the session when Home Assistant stops."""
+            await session.close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close)
+        domain_data["session"] = session
+        domain_data["pool_stats"] = pool_stats
+        _LOGGER.debug(
+            "Created Swedavia client session with %d connections per host",
+            POOL_LIMIT_PER_HOST,
+        )
+
+    return domain_data["session"]
+
+
+async def async_close_session(hass: HomeAssistant) -> None:
+    """Close the integration's client session, if it was created."""
+    domain_data = hass.data.get(DOMAIN, {})
+    domain_data.pop("pool_stats", None)
+    if session := domain_data.pop("session", None):
+        await session.close()
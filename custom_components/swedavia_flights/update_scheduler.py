@@ -1,24 +1,41 @@
 """Smart Update Scheduler for Swedavia Flight Information."""
 from __future__ import annotations
 
-from datetime import timedelta
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
 import logging
-from typing import TYPE_CHECKING
+import time
+from typing import Any, TYPE_CHECKING
+from zoneinfo import ZoneInfo
 
 from homeassistant.core import HomeAssistant
 
 from .const import (
     CONF_AIRPORT,
+    CONF_FETCH_MODE,
     CONF_FLIGHT_TYPE,
+    CONF_HOURS_AHEAD,
+    CONF_HOURS_BACK,
+    DEFAULT_FETCH_MODE,
     DOMAIN,
+    FETCH_MODE_DATE,
+    FETCH_MODE_DELTA,
+    FETCH_MODE_WINDOW,
     FLIGHT_TYPE_ARRIVALS,
     FLIGHT_TYPE_BOTH,
     FLIGHT_TYPE_DEPARTURES,
+    SEGMENT_REFRESH_LATER,
+    SEGMENT_REFRESH_TOMORROW,
+    SWEDAVIA_TIME_ZONE,
 )
+from .date_planner import average_dates_by_offset
+from .models import FlightStatus
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
 
+    from .models import Flight
+
 _LOGGER = logging.getLogger(__name__)
 
 # API limit: 10,001 calls per 30 days
@@ -29,6 +46,27 @@ SAFETY_MARGIN = 0.85  # Use only 85% of limit for safety
 # Calculate available calls per day
 MAX_CALLS_PER_DAY = int((API_LIMIT * SAFETY_MARGIN) / DAYS_IN_MONTH)  # ~283 calls/day
 
+# Adaptive interval, as factors of the normal interval
+ACTIVE_INTERVAL_FACTOR = 0.5  # Flights boarding, departing or landing
+QUIET_INTERVAL_FACTOR = 4  # Next movement hours away
+MIN_ADAPTIVE_INTERVAL = 120  # Seconds
+
+# Daily update budget
+ACTIVE_BUDGET_LEAD = 3600  # Seconds of normal updates an active board may run ahead
+QUIET_SAVINGS_KEPT = 0.5  # Share of the updates skipped in quiet hours not spent later
+
+# Board activity windows, in seconds
+GATE_OPEN_LEAD = 45 * 60  # Assumed gate opening before departure if unknown
+LANDING_LEAD = 30 * 60  # Arrivals this close to landing are active
+BAGGAGE_WINDOW = 45 * 60  # Landed arrivals stay active while bags come out
+QUIET_HORIZON = 2 * 3600  # No movement within this is quiet
+OVERDUE_LIMIT = 3600  # Flights this long past due without moving are ignored
+
+# Flights that will not land or depart here
+INACTIVE_STATUSES = frozenset(
+    {FlightStatus.CANCELLED, FlightStatus.DIVERTED, FlightStatus.REROUTED}
+)
+
 
 class UpdateScheduler:
     """Calculate optimal update intervals based on configuration."""
@@ -50,15 +88,19 @@ class UpdateScheduler:
         calls_per_update = self._calculate_calls_per_update(entry)
         
         # Calculate total calls per update across all entries
-        total_calls_per_update = sum(
-            self._calculate_calls_per_update(e) for e in all_entries
+        total_calls_per_update = self._calculate_total_calls_per_update(all_entries)
+        
+        # Future days are refreshed on their own schedule, whatever the interval
+        segment_calls_per_day = sum(
+            self._calculate_segment_calls_per_day(e) for e in all_entries
         )
         
         # Calculate optimal interval to stay under daily limit
-        # We want: (86400 seconds / interval) * total_calls_per_update < MAX_CALLS_PER_DAY
-        # Therefore: interval > (86400 * total_calls_per_update) / MAX_CALLS_PER_DAY
+        # We want: (86400 / interval) * total_calls_per_update + segment calls < MAX_CALLS_PER_DAY
+        # Therefore: interval > (86400 * total_calls_per_update) / (MAX_CALLS_PER_DAY - segment calls)
         
-        min_interval = (86400 * total_calls_per_update) / MAX_CALLS_PER_DAY
+        available_calls_per_day = max(MAX_CALLS_PER_DAY - segment_calls_per_day, 1)
+        min_interval = (86400 * total_calls_per_update) / available_calls_per_day
         
         # Round up to nearest 5 minutes for cleaner intervals
         min_interval_minutes = int(min_interval / 60) + 1
@@ -71,7 +113,7 @@ class UpdateScheduler:
         
         _LOGGER.info(
             "Calculated update interval for %s: %d minutes "
-            "(calls per update: %d, total calls per update across all airports: %d)",
+            "(calls per update: %.1f, total calls per update across all airports: %.1f)",
             entry.data.get(CONF_AIRPORT, "unknown"),
             final_interval_minutes,
             calls_per_update,
@@ -80,62 +122,76 @@ class UpdateScheduler:
         
         return interval
 
-    def calculate_offset(self, entry: ConfigEntry) -> timedelta:
+    def _calculate_calls_per_update(self, entry: ConfigEntry) -> float:
         """
-        Calculate time offset for staggered updates across multiple airports.
+        Calculate expected API calls per update for a config entry.
         
-        This ensures that if you have multiple airports configured,
-        they don't all update at the same time.
+        Assumes:
+        - One call per Swedish local date up to today that the time window
+          crosses, per flight type, averaged over the day (hours_back=2
+          crosses into yesterday just after midnight). Later days are
+          refreshed on their own schedule, see _calculate_segment_calls_per_day
+        - Both: twice the calls of arrivals or departures only
+        - Delta sync: 1 call (one batched /query shared by all delta entries)
+        - Time window: 1 call (one /query for both directions)
         """
-        all_entries = self._hass.config_entries.async_entries(DOMAIN)
-        
-        if len(all_entries) <= 1:
-            return timedelta(seconds=0)
-        
-        # Find the index of this entry
-        try:
-            entry_index = all_entries.index(entry)
-        except ValueError:
-            entry_index = 0
-        
-        # Calculate the update interval
-        interval = self.calculate_optimal_interval(entry)
-        
-        # Distribute offsets evenly across the interval
-        offset_seconds = (interval.total_seconds() / len(all_entries)) * entry_index
-        
-        offset = timedelta(seconds=int(offset_seconds))
-        
-        _LOGGER.info(
-            "Calculated update offset for %s: %d seconds "
-            "(entry %d of %d)",
-            entry.data.get(CONF_AIRPORT, "unknown"),
-            int(offset_seconds),
-            entry_index + 1,
-            len(all_entries),
+        if entry.data.get(CONF_FETCH_MODE, DEFAULT_FETCH_MODE) in (
+            FETCH_MODE_DELTA,
+            FETCH_MODE_WINDOW,
+        ):
+            return 1
+
+        dates_per_type, _, _ = average_dates_by_offset(
+            entry.data.get(CONF_HOURS_BACK, 2),
+            entry.data.get(CONF_HOURS_AHEAD, 24),
         )
+        return dates_per_type * self._flight_types(entry)
+
+    def _calculate_segment_calls_per_day(self, entry: ConfigEntry) -> float:
+        """
+        Calculate API calls per day for days after today in whole days mode.
         
-        return offset
+        Tomorrow is fetched about hourly and later days a few times a day,
+        independent of the update interval.
+        """
+        if entry.data.get(CONF_FETCH_MODE, DEFAULT_FETCH_MODE) != FETCH_MODE_DATE:
+            return 0
+
+        _, tomorrow, later = average_dates_by_offset(
+            entry.data.get(CONF_HOURS_BACK, 2),
+            entry.data.get(CONF_HOURS_AHEAD, 24),
+        )
+        calls_per_type = (
+            tomorrow * 86400 / SEGMENT_REFRESH_TOMORROW
+            + later * 86400 / SEGMENT_REFRESH_LATER
+        )
+        return calls_per_type * self._flight_types(entry)
+
+    @staticmethod
+    def _flight_types(entry: ConfigEntry) -> int:
+        """Get how many flight types an entry fetches separately."""
+        if entry.data.get(CONF_FLIGHT_TYPE, FLIGHT_TYPE_BOTH) == FLIGHT_TYPE_BOTH:
+            return 2  # Both arrivals and departures
+        return 1  # Only arrivals or departures
 
-    def _calculate_calls_per_update(self, entry: ConfigEntry) -> int:
+    def _calculate_total_calls_per_update(self, entries: list[ConfigEntry]) -> float:
         """
-        Calculate expected API calls per update for a config entry.
+        Calculate expected API calls per update cycle across all entries.
         
-        Assumes:
-        - With hours_ahead=24, hours_back=2: typically 2 dates (today + tomorrow)
-        - Arrivals only: 2 calls
-        - Departures only: 2 calls
-        - Both: 4 calls
+        Delta sync entries share one batched /query call per cycle, so they
+        count once in total instead of once per entry.
         """
-        flight_type = entry.data.get(CONF_FLIGHT_TYPE, FLIGHT_TYPE_BOTH)
+        date_entries = [
+            e
+            for e in entries
+            if e.data.get(CONF_FETCH_MODE, DEFAULT_FETCH_MODE) != FETCH_MODE_DELTA
+        ]
+        total = sum(self._calculate_calls_per_update(e) for e in date_entries)
         
-        # Estimate 2 date ranges (today + tomorrow) for 24h ahead window
-        dates_per_type = 2
+        if len(date_entries) < len(entries):
+            total += 1
         
-        if flight_type == FLIGHT_TYPE_BOTH:
-            return dates_per_type * 2  # Both arrivals and departures
-        else:
-            return dates_per_type  # Only arrivals or departures
+        return total
 
     def get_schedule_info(self) -> dict:
         """Get information about the current update schedule."""
@@ -152,19 +208,22 @@ class UpdateScheduler:
         
         # Calculate for first entry (they all have same interval)
         interval = self.calculate_optimal_interval(all_entries[0])
-        total_calls_per_update = sum(
-            self._calculate_calls_per_update(e) for e in all_entries
+        total_calls_per_update = self._calculate_total_calls_per_update(all_entries)
+        segment_calls_per_day = sum(
+            self._calculate_segment_calls_per_day(e) for e in all_entries
         )
         
         updates_per_day = 86400 / interval.total_seconds()
-        estimated_daily_calls = int(updates_per_day * total_calls_per_update)
+        estimated_daily_calls = int(
+            updates_per_day * total_calls_per_update + segment_calls_per_day
+        )
         estimated_monthly_calls = estimated_daily_calls * DAYS_IN_MONTH
         percentage = (estimated_monthly_calls / API_LIMIT) * 100
         
         return {
             "total_entries": len(all_entries),
             "update_interval_minutes": int(interval.total_seconds() / 60),
-            "total_calls_per_update": total_calls_per_update,
+            "total_calls_per_update": round(total_calls_per_update, 1),
             "updates_per_day": int(updates_per_day),
             "estimated_daily_calls": estimated_daily_calls,
             "estimated_monthly_calls": estimated_monthly_calls,
@@ -173,17 +232,138 @@ class UpdateScheduler:
         }
 
 
-def calculate_update_schedule(
-    hass: HomeAssistant, entry: ConfigEntry
-) -> tuple[timedelta, timedelta]:
-    """
-    Calculate optimal update interval and offset for a config entry.
-    
-    Returns:
-        tuple: (update_interval, offset)
+class AdaptiveInterval:
+    """Pick each update interval from the activity on the flight board.
+
+    Updates come faster while flights are between gate opening and
+    departure or close to landing, and slower while the next movement is
+    hours away. The updates the normal interval would make in a day form
+    a daily budget. Half of the updates skipped in quiet hours are taken
+    off it, so quiet hours save calls; the rest pays for busy hours. An
+    active board may also run up to an hour of updates ahead of the
+    budget earned so far; otherwise the rest of the day's budget is spread
+    over the rest of the day, which pays the lead back. The day's updates
+    stay within its budget, and an interval is never longer than the
+    quiet interval.
     """
-    scheduler = UpdateScheduler(hass)
-    interval = scheduler.calculate_optimal_interval(entry)
-    offset = scheduler.calculate_offset(entry)
-    
-    return interval, offset
+
+    def __init__(self, normal_interval: timedelta) -> None:
+        """Initialize the adaptive interval."""
+        self._normal = normal_interval.total_seconds()
+        self._tz = ZoneInfo(SWEDAVIA_TIME_ZONE)
+        self._day: date | None = None
+        self._day_seconds = 0.0
+        self._budget = 0.0
+        self._saved = 0.0
+        self._updates = 0
+        self._throttle = 1.0
+        # Whether the board asked for faster updates last time
+        self.active = False
+
+    def _seconds_left_today(self, now: float) -> float:
+        """Get the seconds until Swedish local midnight."""
+        local = datetime.fromtimestamp(now, self._tz)
+        midnight = datetime.combine(
+            local.date() + timedelta(days=1), datetime.min.time(), self._tz
+        )
+        return max((midnight - local).total_seconds(), 1)
+
+    @staticmethod
+    def _activity_interval(
+        flights: Iterable[Flight], now: float, normal: float
+    ) -> float:
+        """Get the interval the board activity asks for."""
+        next_movement: int | None = None
+
+        for flight in flights:
+            moment = flight.effective_ts
+            if not moment or flight.status in INACTIVE_STATUSES:
+                continue
+
+            if flight.is_arrival:
+                if flight.status is FlightStatus.LANDED or flight.actual:
+                    if flight.last_bag is None and now - moment < BAGGAGE_WINDOW:
+                        return normal * ACTIVE_INTERVAL_FACTOR
+                    continue
+                if moment - LANDING_LEAD <= now < moment + OVERDUE_LIMIT:
+                    return normal * ACTIVE_INTERVAL_FACTOR
+            else:
+                if flight.status is FlightStatus.DEPARTED or flight.actual:
+                    continue
+                gate_open = (
+                    flight.gate_open.timestamp()
+                    if flight.gate_open
+                    else moment - GATE_OPEN_LEAD
+                )
+                if gate_open <= now < moment + OVERDUE_LIMIT:
+                    return normal * ACTIVE_INTERVAL_FACTOR
+
+            if moment > now and (next_movement is None or moment < next_movement):
+                next_movement = moment
+
+        if next_movement is None or next_movement - now > QUIET_HORIZON:
+            # Wake up in time for the next movement
+            wait = (
+                next_movement - now - LANDING_LEAD
+                if next_movement is not None
+                else normal * QUIET_INTERVAL_FACTOR
+            )
+            return min(max(wait, normal), normal * QUIET_INTERVAL_FACTOR)
+
+        return normal
+
+    def next_interval(
+        self,
+        flights: Iterable[Flight],
+        now: float | None = None,
+        throttle: float = 1.0,
+    ) -> timedelta:
+        """Count an update and get the interval until the next one.
+
+        The normal interval, and with it the daily budget, is scaled by
+        ``throttle``.
+        """
+        now = now or time.time()
+        normal = self._normal * throttle
+        seconds_left = self._seconds_left_today(now)
+
+        today = datetime.fromtimestamp(now, self._tz).date()
+        if today != self._day:
+            # A day started mid-way (setup) only gets its share of the budget
+            self._day = today
+            self._day_seconds = seconds_left
+            self._budget = seconds_left / self._normal
+            self._saved = 0.0
+            self._updates = 0
+        self._updates += 1
+
+        self._throttle = throttle
+        budget = self._budget / throttle - self._saved
+        earned = (self._day_seconds - seconds_left) / normal - self._saved
+
+        activity_interval = self._activity_interval(flights, now, normal)
+        self.active = activity_interval < normal
+        quiet = normal * QUIET_INTERVAL_FACTOR
+        if self.active and self._updates < min(
+            earned + ACTIVE_BUDGET_LEAD / normal, budget - seconds_left / quiet
+        ):
+            # Run ahead of the budget earned so far, as long as the quiet
+            # interval for the rest of the day would still fit the budget
+            interval = activity_interval
+        else:
+            # Pay back running ahead: the rest of the day's budget spread
+            # over the rest of the day, if longer than the normal interval
+            budget_interval = seconds_left / max(budget - self._updates, 1)
+            interval = max(activity_interval, normal, budget_interval)
+
+        interval = min(max(interval, MIN_ADAPTIVE_INTERVAL), quiet)
+        if activity_interval > normal:
+            self._saved += (activity_interval - normal) / normal * QUIET_SAVINGS_KEPT
+        return timedelta(seconds=int(interval))
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get today's budget and use."""
+        return {
+            "daily_update_budget": int(self._budget / self._throttle - self._saved),
+            "updates_today": self._updates,
+        }